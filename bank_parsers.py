@@ -0,0 +1,189 @@
+import re
+from datetime import datetime
+import pdfplumber
+
+# Registered statement formats, checked in registration order (the generic line format is the fallback)
+PARSERS = []
+
+# Column-aware table layouts: bank marker on the first page, header names per column, date formats
+TABLE_FORMATS = [
+    {
+        "name": "hdfc", "markers": ["hdfc bank"],
+        "date": ["date"], "description": ["narration"], "debit": ["withdrawal amt.", "withdrawal amt"],
+        "credit": ["deposit amt.", "deposit amt"], "balance": ["closing balance"],
+        "date_formats": ["%d/%m/%y", "%d/%m/%Y"],
+    },
+    {
+        "name": "sbi", "markers": ["state bank of india"],
+        "date": ["txn date"], "description": ["description"], "debit": ["debit"],
+        "credit": ["credit"], "balance": ["balance"],
+        "date_formats": ["%d %b %Y", "%d-%b-%Y"],
+    },
+    {
+        "name": "icici", "markers": ["icici bank"],
+        "date": ["date", "transaction date"], "description": ["particulars"], "debit": ["withdrawals"],
+        "credit": ["deposits"], "balance": ["balance"],
+        "date_formats": ["%d-%m-%Y", "%d/%m/%Y"],
+    },
+    {
+        "name": "generic_table", "markers": [],
+        "date": ["date", "txn date", "transaction date", "value date"],
+        "description": ["description", "narration", "particulars", "details", "remarks"],
+        "debit": ["debit", "withdrawal", "withdrawals", "withdrawal amt.", "dr"],
+        "credit": ["credit", "deposit", "deposits", "deposit amt.", "cr"],
+        "balance": ["balance", "closing balance", "running balance"],
+        "date_formats": ["%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d %b %Y", "%Y-%m-%d"],
+    },
+]
+
+LINE_PATTERN = re.compile(r"(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?[\d,]+\.\d{2})(?:\s+(-?[\d,]+\.\d{2}))?$")
+FOOTER_PATTERN = re.compile(r"(?i)^(page \d+|statement of account|opening balance|closing balance|total)")
+HEADER_PATTERN = re.compile(r"(?i)^((txn|value|transaction) )?date\b")
+AMOUNT_PATTERN = re.compile(r"\d[\d,]*\.\d{2}\b")
+
+# Register a statement format
+def register_parser(name, detect, parse):
+    PARSERS.append({"name": name, "detect": detect, "parse": parse})
+
+# Parse an amount cell such as "1,234.56", "1,234.56 Cr", "(12.00)" or "-"; None if it is not an amount
+def parse_amount(value):
+    if value is None:
+        return 0.0
+    text = str(value).replace(",", "").replace("₹", "").strip()
+    if text in ("", "-", "--"):
+        return 0.0
+    sign = -1.0 if (text.startswith("(") and text.endswith(")")) or text.lower().endswith("dr") else 1.0
+    text = re.sub(r"(?i)\s*(cr|dr)$", "", text).strip("() ")
+    try:
+        return sign * float(text)
+    except ValueError:
+        return None
+
+# Parse a date cell with the given formats into an ISO date string; None if it is not a date
+def parse_date(value, date_formats):
+    text = " ".join(str(value or "").split())
+    for date_format in date_formats:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+# Normalize a header cell for matching
+def normalize_header(cell):
+    return " ".join(str(cell or "").lower().split())
+
+# Map column roles to positions from a header row; None if the row is not a header
+def match_header(row, table_format):
+    headers = [normalize_header(cell) for cell in row]
+    columns = {}
+    for role in ["date", "description", "debit", "credit", "balance"]:
+        for position, header in enumerate(headers):
+            if header in table_format[role] and position not in columns.values():
+                columns[role] = position
+                break
+    return columns if {"date", "debit", "credit", "balance"} <= set(columns) else None
+
+# Column-aware table extraction; rows without a date continue the previous description
+def parse_table_statement(pdf, table_format):
+    transactions = []
+    columns = None
+    for page in pdf.pages:
+        for table in page.extract_tables():
+            for row in table:
+                header_columns = match_header(row, table_format)
+                if header_columns:
+                    columns = header_columns
+                    continue
+                if columns is None or len(row) <= max(columns.values()):
+                    continue
+                description = " ".join(str(row[columns["description"]] or "").split()) if "description" in columns else ""
+                txn_date = parse_date(row[columns["date"]], table_format["date_formats"])
+                if txn_date is None:
+                    if transactions and description and not FOOTER_PATTERN.match(description):
+                        transactions[-1]["description"] = f"{transactions[-1]['description']} {description}"
+                    continue
+                debit, credit, balance = (parse_amount(row[columns[role]]) for role in ["debit", "credit", "balance"])
+                if debit is None or credit is None or balance is None:
+                    continue
+                transactions.append({
+                    "date": txn_date,
+                    "description": description,
+                    "debit": abs(debit),
+                    "credit": abs(credit),
+                    "balance": balance,
+                })
+    return transactions
+
+# A wrapped description line: not a header, footer or total, and no amounts
+def is_continuation_line(line):
+    return bool(line) and not FOOTER_PATTERN.match(line) and not HEADER_PATTERN.match(line) and not AMOUNT_PATTERN.search(line)
+
+# Single-line format "dd/mm/yyyy description amount [balance]", with wrapped description lines
+# (a description never continues across a page break)
+def parse_line_statement(pdf):
+    transactions = []
+    for page in pdf.pages:
+        continuing = False
+        text = page.extract_text()
+        if not text:
+            continue
+        for line in text.split("\n"):
+            line = line.strip()
+            match = LINE_PATTERN.match(line)
+            if match:
+                txn_date, desc, amount, balance = match.groups()
+                amount = parse_amount(amount)
+                transactions.append({
+                    "date": parse_date(txn_date, ["%d/%m/%Y"]),
+                    "description": desc,
+                    "debit": abs(amount) if amount < 0 else 0.0,
+                    "credit": amount if amount > 0 else 0.0,
+                    "balance": parse_amount(balance) if balance else 0.0,
+                })
+                continuing = True
+            elif continuing and is_continuation_line(line):
+                transactions[-1]["description"] = f"{transactions[-1]['description']} {line}"
+            else:
+                continuing = False
+    return [t for t in transactions if t["date"]]
+
+# Detect a table format by its bank marker, or by a recognizable header for the generic layout
+def make_table_detector(table_format):
+    def detect(first_page_text):
+        text = first_page_text.lower()
+        if table_format["markers"]:
+            return any(marker in text for marker in table_format["markers"])
+        return "balance" in text and any(word in text for word in ["debit", "withdrawal"])
+    return detect
+
+for table_format in TABLE_FORMATS:
+    register_parser(
+        table_format["name"],
+        make_table_detector(table_format),
+        lambda pdf, table_format=table_format: parse_table_statement(pdf, table_format)
+    )
+register_parser("generic_line", lambda first_page_text: True, parse_line_statement)
+
+# Names of all registered formats
+def parser_names():
+    return [parser["name"] for parser in PARSERS]
+
+# Formats whose detector accepts the first page, in registration order
+def detect_formats(pdf):
+    first_page_text = (pdf.pages[0].extract_text() or "") if pdf.pages else ""
+    return [parser for parser in PARSERS if parser["detect"](first_page_text)]
+
+# Parse a bank statement PDF with the given format, or the first detected format that finds transactions
+# Returns (format name, transactions, page count)
+def parse_bank_statement(pdf_file, parser_name=None):
+    with pdfplumber.open(pdf_file) as pdf:
+        if parser_name:
+            candidates = [parser for parser in PARSERS if parser["name"] == parser_name]
+        else:
+            candidates = detect_formats(pdf)
+        for parser in candidates:
+            transactions = parser["parse"](pdf)
+            if transactions:
+                return parser["name"], transactions, len(pdf.pages)
+        return None, [], len(pdf.pages)
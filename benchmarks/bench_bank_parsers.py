@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_parsers import parse_bank_statement  # noqa: E402
+from generate_bank_fixtures import FIXTURES_DIR, generate_fixtures  # noqa: E402
+
+# Compare parser output with the generator's expected totals
+def check_result(format_name, transactions, expected, detected_name):
+    problems = []
+    if detected_name != format_name:
+        problems.append(f"detected as {detected_name}")
+    if len(transactions) != expected["transactions"]:
+        problems.append(f"{len(transactions)} of {expected['transactions']} transactions")
+    if transactions:
+        if abs(sum(t["debit"] for t in transactions) - expected["total_debit"]) > 0.01:
+            problems.append("debit total mismatch")
+        if abs(sum(t["credit"] for t in transactions) - expected["total_credit"]) > 0.01:
+            problems.append("credit total mismatch")
+        if abs(transactions[-1]["balance"] - expected["closing_balance"]) > 0.01:
+            problems.append("closing balance mismatch")
+        if sum(" REF " in t["description"] for t in transactions) != expected["multi_line_descriptions"]:
+            problems.append("multi-line descriptions lost")
+        if [t["description"] for t in transactions] != expected["descriptions"][:len(transactions)]:
+            problems.append("descriptions differ")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Bank statement parser throughput benchmark")
+    parser.add_argument("--pages", type=int, default=10, help="pages per generated fixture")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per fixture")
+    parser.add_argument("--regenerate", action="store_true", help="regenerate the fixture corpus")
+    args = parser.parse_args()
+
+    expected_path = os.path.join(FIXTURES_DIR, "expected.json")
+    if args.regenerate or not os.path.exists(expected_path):
+        generate_fixtures(args.pages)
+    with open(expected_path) as f:
+        expected = json.load(f)
+
+    print(f"{'format':<15}{'pages':>7}{'txns':>7}{'pages/s':>10}{'txns/s':>10}  check")
+    failures = 0
+    for format_name, info in expected.items():
+        path = os.path.join(FIXTURES_DIR, info["file"])
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            detected_name, transactions, num_pages = parse_bank_statement(path)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        problems = check_result(format_name, transactions, info, detected_name)
+        failures += bool(problems)
+        print(f"{format_name:<15}{num_pages:>7}{len(transactions):>7}{num_pages / best:>10.1f}{len(transactions) / best:>10.1f}  {'; '.join(problems) or 'ok'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Table layouts to generate: bank title, header row and how to format each cell
+TABLE_LAYOUTS = {
+    "hdfc": {
+        "title": "HDFC BANK Ltd - Statement of Account",
+        "header": ["Date", "Narration", "Chq./Ref.No.", "Value Dt", "Withdrawal Amt.", "Deposit Amt.", "Closing Balance"],
+        "date_format": "%d/%m/%y",
+        "row": lambda t, d: [d, t["description"], t["ref"], d, t["debit_text"], t["credit_text"], t["balance_text"]],
+    },
+    "sbi": {
+        "title": "State Bank of India - Account Statement",
+        "header": ["Txn Date", "Value Date", "Description", "Ref No./Cheque No.", "Debit", "Credit", "Balance"],
+        "date_format": "%d %b %Y",
+        "row": lambda t, d: [d, d, t["description"], t["ref"], t["debit_text"], t["credit_text"], t["balance_text"]],
+    },
+    "icici": {
+        "title": "ICICI Bank - Detailed Statement",
+        "header": ["S No.", "Date", "Cheque Number", "Particulars", "Withdrawals", "Deposits", "Balance"],
+        "date_format": "%d-%m-%Y",
+        "row": lambda t, d: [str(t["index"] + 1), d, t["ref"], t["description"], t["debit_text"], t["credit_text"], t["balance_text"]],
+    },
+    "generic_table": {
+        "title": "Sahyadri Co-operative Credit Society - Account Statement",
+        "header": ["Transaction Date", "Details", "Debit", "Credit", "Running Balance"],
+        "date_format": "%Y-%m-%d",
+        "row": lambda t, d: [d, t["description"], t["debit_text"], t["credit_text"], t["balance_text"]],
+    },
+}
+LINE_HEADER = "Date Description Amount Balance"
+DESCRIPTIONS = ["UPI/PAYTM SETTLEMENT", "NEFT FROM FLEET CARD", "CASH DEPOSIT", "POS SETTLEMENT ICICI", "CHQ DEP SHARMA TRADERS",
+                "NEFT TO HPCL FUEL PURCHASE", "ELECTRICITY BILL", "SALARY TRANSFER", "RTGS TO OIL SUPPLIER"]
+ROWS_PER_PAGE = 24
+
+# Random transactions with a running balance; some descriptions wrap onto a second line
+def make_transactions(num_rows, seed):
+    rng = random.Random(seed)
+    balance = 250000.0
+    start = date(2025, 4, 1)
+    transactions = []
+    for index in range(num_rows):
+        amount = round(rng.uniform(100, 50000), 2)
+        is_debit = rng.random() < 0.45
+        balance = round(balance - amount if is_debit else balance + amount, 2)
+        description = rng.choice(DESCRIPTIONS)
+        if rng.random() < 0.3:
+            description = f"{description}\nREF {rng.randint(100000, 999999)} BRANCH {rng.choice(['PUNE', 'NASIK', 'SATARA'])}"
+        transactions.append({
+            "index": index,
+            "date": start + timedelta(days=index // 3),
+            "description": description,
+            "ref": str(rng.randint(10000000, 99999999)),
+            "debit": amount if is_debit else 0.0,
+            "credit": 0.0 if is_debit else amount,
+            "balance": balance,
+            "debit_text": f"{amount:,.2f}" if is_debit else "",
+            "credit_text": "" if is_debit else f"{amount:,.2f}",
+            "balance_text": f"{balance:,.2f}",
+        })
+    return transactions
+
+# Statement with a bordered transaction table and a bank title on the first page
+def write_table_statement(path, layout, transactions):
+    doc = SimpleDocTemplate(path, pagesize=A4)
+    styles = getSampleStyleSheet()
+    rows = [layout["header"]] + [layout["row"](t, t["date"].strftime(layout["date_format"])) for t in transactions]
+    table = Table(rows, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+    ]))
+    doc.build([Paragraph(layout["title"], styles['Title']), Spacer(1, 12), table])
+
+# Statement in the plain "dd/mm/yyyy description amount balance" line layout, with a column header
+# on every page and a totals line at the end
+def write_line_statement(path, transactions):
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    y = height - 50
+    pdf.setFont("Helvetica", 9)
+    pdf.drawString(40, y, "Account Transactions")
+    y -= 20
+    pdf.drawString(40, y, LINE_HEADER)
+    y -= 16
+    for t in transactions:
+        lines = t["description"].split("\n")
+        if y < 60 + 12 * len(lines):
+            pdf.showPage()
+            pdf.setFont("Helvetica", 9)
+            y = height - 50
+            pdf.drawString(40, y, LINE_HEADER)
+            y -= 16
+        amount = -t["debit"] if t["debit"] else t["credit"]
+        pdf.drawString(40, y, f"{t['date'].strftime('%d/%m/%Y')} {lines[0]} {amount:.2f} {t['balance']:.2f}")
+        for line in lines[1:]:
+            y -= 12
+            pdf.drawString(60, y, line)
+        y -= 14
+    pdf.drawString(40, y, f"Total debits {sum(t['debit'] for t in transactions):.2f} credits {sum(t['credit'] for t in transactions):.2f}")
+    pdf.save()
+
+# Write every fixture plus the expected totals used to check parser output
+def generate_fixtures(pages=10, output_dir=FIXTURES_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    expected = {}
+    layouts = list(TABLE_LAYOUTS) + ["generic_line"]
+    for seed, name in enumerate(layouts):
+        transactions = make_transactions(pages * ROWS_PER_PAGE, seed)
+        path = os.path.join(output_dir, f"{name}.pdf")
+        if name == "generic_line":
+            write_line_statement(path, transactions)
+        else:
+            write_table_statement(path, TABLE_LAYOUTS[name], transactions)
+        expected[name] = {
+            "file": os.path.basename(path),
+            "transactions": len(transactions),
+            "total_debit": round(sum(t["debit"] for t in transactions), 2),
+            "total_credit": round(sum(t["credit"] for t in transactions), 2),
+            "closing_balance": transactions[-1]["balance"],
+            "multi_line_descriptions": sum("\n" in t["description"] for t in transactions),
+            "descriptions": [" ".join(t["description"].split()) for t in transactions],
+        }
+    with open(os.path.join(output_dir, "expected.json"), "w") as f:
+        json.dump(expected, f, indent=2)
+    return expected
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, info in generate_fixtures(pages).items():
+        print(f"{name}: {info['transactions']} transactions -> {os.path.join(FIXTURES_DIR, info['file'])}")
@@ -0,0 +1,224 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "petrol_dashboard.py")
+NOZZLES = ["petrol_c3", "petrol_c4", "petrol_a1", "petrol_a2", "hsd_c1", "hsd_c2", "hsd_b1", "hsd_b2", "xp_b3", "xp_b4"]
+PARTIES = ["Sharma Traders", "Patil Transport", "Jadhav Logistics", "Kulkarni Farms", "City Bus Depot"]
+EMPLOYEES = ["Ramesh", "Suresh", "Ganesh", "Mahesh"]
+
+# Write a station with `days` of sales plus party, cheque and shortage history
+def generate_dataset(data_dir, days, station="main", seed=0):
+    rng = random.Random(seed)
+    station_dir = os.path.join(data_dir, "stations", station)
+    os.makedirs(station_dir, exist_ok=True)
+    start = date.today() - timedelta(days=days)
+    readings = {nozzle: rng.uniform(10000, 50000) for nozzle in NOZZLES}
+    rates = {"petrol_rate": 104.62, "hsd_rate": 91.16, "xp_rate": 111.57}
+    sales, party, cheques, shortage = [], [], [], []
+    for day in range(days):
+        current = str(start + timedelta(days=day))
+        row = {"id": day + 1, "date": current}
+        for nozzle in NOZZLES:
+            sold = round(rng.uniform(50, 900), 1)
+            row[f"{nozzle}_open"] = round(readings[nozzle], 1)
+            readings[nozzle] += sold
+            row[f"{nozzle}_close"] = round(readings[nozzle], 1)
+            row[f"{nozzle}_sales"] = row[f"{nozzle}_close"] - row[f"{nozzle}_open"]
+        row.update({f"test_b{i}": 0.0 for i in range(1, 5)})
+        row.update(rates)
+        row["petrol_amount"] = sum(row[f"{n}_sales"] for n in NOZZLES[:4]) * rates["petrol_rate"]
+        row["hsd_amount"] = sum(row[f"{n}_sales"] for n in NOZZLES[4:8]) * rates["hsd_rate"]
+        row["xp_amount"] = sum(row[f"{n}_sales"] for n in NOZZLES[8:]) * rates["xp_rate"]
+        oil_amounts = [round(rng.uniform(100, 900), 2) for _ in range(rng.randint(0, 2))]
+        row["oil_products"] = ";".join("Engine Oil" for _ in oil_amounts)
+        row["oil_amounts"] = ";".join(str(amount) for amount in oil_amounts)
+        row["total_oil_amount"] = sum(oil_amounts)
+        row["paytm_amount"] = round(rng.uniform(1000, 20000), 2)
+        row["icici_amount"] = round(rng.uniform(1000, 20000), 2)
+        row["fleet_card_amount"] = round(rng.uniform(0, 5000), 2)
+        row["pump_expenses"] = round(rng.uniform(0, 2000), 2)
+        row["pump_expenses_remark"] = "misc"
+        row["gross_sales_amount"] = row["petrol_amount"] + row["hsd_amount"] + row["xp_amount"] + row["total_oil_amount"]
+        row["cash_in"] = row["paytm_amount"] + row["icici_amount"] + row["fleet_card_amount"]
+        row["cash_out"] = row["pump_expenses"]
+        row["total_sales_amount"] = row["gross_sales_amount"] - row["cash_in"] - row["cash_out"]
+        row["net_cash"] = row["cash_in"] - row["cash_out"]
+        row["credit_balance"] = row["total_sales_amount"] - row["cash_in"]
+        sales.append(row)
+        for _ in range(rng.randint(1, 4)):
+            party.append({"id": len(party) + 1, "date": current, "party_name": rng.choice(PARTIES),
+                          "credit_amount": round(rng.uniform(0, 20000), 2), "debit_amount": round(rng.uniform(0, 5000), 2), "remark": ""})
+        if rng.random() < 0.2:
+            cheques.append({"id": len(cheques) + 1, "date": current, "party_name": rng.choice(PARTIES), "bank": "SBI",
+                            "cheque_date": current, "cheque_no": str(rng.randint(100000, 999999)), "branch": "Main", "amount": round(rng.uniform(1000, 50000), 2)})
+        if rng.random() < 0.3:
+            shortage.append({"id": len(shortage) + 1, "date": current, "employee_name": rng.choice(EMPLOYEES), "shortage_amount": round(rng.uniform(10, 500), 2)})
+
+    pd.DataFrame(sales).to_csv(os.path.join(station_dir, "petrol_sales.csv"), index=False)
+    pd.DataFrame(party).to_csv(os.path.join(station_dir, "party_ledger.csv"), index=False)
+    pd.DataFrame(cheques, columns=["id", "date", "party_name", "bank", "cheque_date", "cheque_no", "branch", "amount"]).to_csv(os.path.join(station_dir, "party_cheques.csv"), index=False)
+    pd.DataFrame(shortage, columns=["id", "date", "employee_name", "shortage_amount"]).to_csv(os.path.join(station_dir, "employee_shortage.csv"), index=False)
+    return start
+
+# Run the app once and record how long the rerun took; with caching off every rerun starts from empty caches
+def timed_run(at, latencies, step, caching=True):
+    if not caching:
+        st.cache_data.clear()
+        st.cache_resource.clear()
+    start = time.perf_counter()
+    at.run()
+    latencies.append((step, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+
+# One simulated staff session: log in, enter sales, save a party entry, then browse filter ranges.
+# Each session runs in its own process because AppTest instances cannot share a process concurrently,
+# so sessions share the data files and the ledger file lock but not Streamlit caches.
+def run_session(session_id, data_dir, iterations, history_start, streaming_mode, caching, timeout, start_barrier):
+    os.chdir(data_dir)
+    rng = random.Random(session_id)
+    latencies = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    start_barrier.wait()
+    timed_run(at, latencies, "initial", caching)
+
+    at.text_input[0].set_value("admin")
+    at.text_input[1].set_value("password123")
+    at.button[0].click()
+    timed_run(at, latencies, "login", caching)
+    at.checkbox(key="streaming_mode").set_value(streaming_mode)
+
+    for _ in range(iterations):
+        at.number_input(key="sales_c3_close").set_value(at.number_input(key="sales_c3_open").value + rng.uniform(10, 500))
+        at.button(key="save_sales").click()
+        timed_run(at, latencies, "save_sales", caching)
+
+        at.text_input(key="party_name").set_value(rng.choice(PARTIES))
+        at.number_input(key="party_credit").set_value(round(rng.uniform(100, 5000), 2))
+        at.button(key="save_party").click()
+        timed_run(at, latencies, "save_party", caching)
+
+        for span in [7, 30, 365, (date.today() - history_start).days]:
+            at.date_input(key="filter_range").set_value([date.today() - timedelta(days=span), date.today()])
+            timed_run(at, latencies, f"filter_{span}d", caching)
+    return latencies, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# Row counts and duplicated ids of the ledgers the sessions write to
+def count_saved_rows(data_dir, station="main"):
+    station_dir = os.path.join(data_dir, "stations", station)
+    counts, duplicates = {}, {}
+    for file in ["petrol_sales.csv", "party_ledger.csv"]:
+        ids = pd.read_csv(os.path.join(station_dir, file), usecols=["id"])["id"]
+        counts[file] = len(ids)
+        duplicates[file] = sorted(int(row_id) for row_id in ids[ids.duplicated()].unique())
+    return counts, duplicates
+
+# Percentile of a sorted list
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Concurrent-session load test for petrol_dashboard.py using Streamlit AppTest",
+        epilog="Each session is an isolated process with its own Streamlit caches; ledger writes are serialized by the "
+               "app's file lock. The numbers describe N independent app processes sharing one data directory, "
+               "not N browser sessions on a single server."
+    )
+    parser.add_argument("--sessions", type=int, default=4, help="simulated concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="entry/filter cycles per session")
+    parser.add_argument("--days", type=int, default=730, help="days of generated history")
+    parser.add_argument("--streaming", choices=["on", "off"], default="on", help="streaming mode for wide ranges")
+    parser.add_argument("--caching", choices=["on", "off"], default="on", help="off clears st.cache_data/st.cache_resource before every rerun")
+    parser.add_argument("--data-dir", default=None, help="working directory for the generated data (default: a temp dir)")
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument("--json", default=None, help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="petrol_load_")
+    history_start = generate_dataset(data_dir, args.days)
+    rows_before, _ = count_saved_rows(data_dir)
+
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager()
+    start_barrier = manager.Barrier(args.sessions + 1)
+    with ProcessPoolExecutor(max_workers=args.sessions, mp_context=context) as executor:
+        futures = [
+            executor.submit(run_session, i, data_dir, args.iterations, history_start, args.streaming == "on", args.caching == "on", args.timeout, start_barrier)
+            for i in range(args.sessions)
+        ]
+        start_barrier.wait()
+        start = time.perf_counter()
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+    manager.shutdown()
+
+    # Every timed save must have landed with its own id: one sales row and one party row per session iteration
+    expected_saves = args.sessions * args.iterations
+    rows_after, duplicate_ids = count_saved_rows(data_dir)
+    save_problems = [
+        f"{file}: {rows_after[file] - rows_before[file]} of {expected_saves} saved rows"
+        for file in rows_before if rows_after[file] - rows_before[file] != expected_saves
+    ] + [f"{file}: duplicate ids {ids[:10]}" for file, ids in duplicate_ids.items() if ids]
+
+    latencies = [latency for session_latencies, _ in results for latency in session_latencies]
+    session_rss = [rss for _, rss in results]
+    all_seconds = sorted(seconds for _, seconds in latencies)
+    by_step = {}
+    for step, seconds in latencies:
+        by_step.setdefault(step, []).append(seconds)
+    report = {
+        "sessions": args.sessions,
+        "iterations": args.iterations,
+        "days": args.days,
+        "streaming": args.streaming,
+        "caching": args.caching,
+        "isolated_processes": True,
+        "duplicate_ids": duplicate_ids,
+        "saved_rows": {file: rows_after[file] - rows_before[file] for file in rows_before},
+        "save_problems": save_problems,
+        "reruns": len(all_seconds),
+        "elapsed_s": elapsed,
+        "throughput_reruns_per_s": len(all_seconds) / elapsed,
+        "p50_ms": percentile(all_seconds, 0.50) * 1000,
+        "p95_ms": percentile(all_seconds, 0.95) * 1000,
+        "p99_ms": percentile(all_seconds, 0.99) * 1000,
+        "peak_rss_mb_per_session": max(session_rss),
+        "peak_rss_mb_total": sum(session_rss),
+        "steps": {
+            step: {"count": len(values), "p50_ms": percentile(sorted(values), 0.50) * 1000, "p95_ms": percentile(sorted(values), 0.95) * 1000}
+            for step, values in by_step.items()
+        },
+    }
+
+    print(f"{args.sessions} sessions x {args.iterations} iterations, {args.days} days of history, streaming {args.streaming}, caching {args.caching}")
+    print("sessions run as isolated processes (no shared Streamlit caches; writes serialized by the ledger file lock)")
+    print(f"reruns: {report['reruns']}  elapsed: {elapsed:.1f}s  throughput: {report['throughput_reruns_per_s']:.2f} reruns/s")
+    print(f"latency p50: {report['p50_ms']:.0f} ms  p95: {report['p95_ms']:.0f} ms  p99: {report['p99_ms']:.0f} ms")
+    print(f"peak RSS: {report['peak_rss_mb_per_session']:.0f} MB per session, {report['peak_rss_mb_total']:.0f} MB across sessions")
+    print(f"{'step':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}")
+    for step, stats in report["steps"].items():
+        print(f"{step:<16}{stats['count']:>7}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}")
+    print(f"saved rows: {', '.join(f'{file} +{count}' for file, count in report['saved_rows'].items())}  {'; '.join(save_problems) or 'ok'}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if save_problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,18 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 import io
-import pdfplumber  # For PDF text extraction
+import json
+import threading
+import shutil
+import math
+import unicodedata
+from contextlib import contextmanager
+try:
+    import fcntl  # Cross-process file locks (POSIX only)
+except ImportError:
+    fcntl = None
+from concurrent.futures import ThreadPoolExecutor
+from bank_parsers import parse_bank_statement, parser_names  # Bank statement PDF parsing
 import re  # For parsing text
 
 # Set page config
@@ -71,39 +82,145 @@ def show_login_page():
             else:
                 st.error("Invalid username or password")
 
-# File paths
-SALES_DATA_PATH = "petrol_sales.csv"
-PARTY_LEDGER_PATH = "party_ledger.csv"
-EMPLOYEE_SHORTAGE_PATH = "employee_shortage.csv"
-OWNERS_TRANSACTION_PATH = "owners_transaction.csv"
-BANK_STATEMENTS_PATH = "bank_statements.csv"
-PARTY_CHEQUES_PATH = "party_cheques.csv"  # New file for cheque entries
-CSV_FILES = [SALES_DATA_PATH, PARTY_LEDGER_PATH, EMPLOYEE_SHORTAGE_PATH, OWNERS_TRANSACTION_PATH, BANK_STATEMENTS_PATH, PARTY_CHEQUES_PATH]
+# Station-scoped storage: each station's files live in their own directory under STATIONS_DIR
+STATIONS_DIR = "stations"
+DEFAULT_STATION = "main"
+LEDGER_FILE_NAMES = {
+    "sales": "petrol_sales.csv",
+    "party_ledger": "party_ledger.csv",
+    "employee_shortage": "employee_shortage.csv",
+    "owners_transaction": "owners_transaction.csv",
+    "bank_statements": "bank_statements.csv",
+    "party_cheques": "party_cheques.csv",  # New file for cheque entries
+}
+LEDGER_CHANGES_FILE = "ledger_changes.csv"  # Pending edits and tombstones
+LEDGER_CHANGES_ARCHIVE_FILE = "ledger_changes_archive.csv"  # Compacted changes, kept for audit
+LEDGER_LOCK_FILE = ".ledger.lock"  # Advisory lock shared by server processes
+LAST_STATE_FILE = "last_state.json"  # Latest closing reading per nozzle and last rates
+NAME_INDEX_FILE = "name_index.json"  # Canonical party, employee and owner names
+MAX_STATION_WORKERS = 8
+
+# Streaming aggregation settings
+STREAM_CHUNK_ROWS = 20000  # Rows per chunk when streaming a ledger
+STREAMING_RANGE_DAYS = 366  # Wider display ranges use streaming aggregation
+
+# Station directory
+def get_station_dir(station):
+    return os.path.join(STATIONS_DIR, station)
+
+# List stations that have a partition
+def list_stations():
+    if not os.path.isdir(STATIONS_DIR):
+        return [DEFAULT_STATION]
+    stations = sorted(name for name in os.listdir(STATIONS_DIR) if os.path.isdir(get_station_dir(name)))
+    return stations or [DEFAULT_STATION]
+
+# Normalize a station name to a safe directory name
+def station_slug(name):
+    return re.sub(r"[^a-z0-9_-]+", "_", name.strip().lower()).strip("_")
+
+# Move data files from the working directory (single-station layout) into the default station
+def migrate_legacy_data():
+    if os.path.isdir(STATIONS_DIR):
+        return
+    station_dir = get_station_dir(DEFAULT_STATION)
+    os.makedirs(station_dir, exist_ok=True)
+    for file in list(LEDGER_FILE_NAMES.values()) + [LEDGER_CHANGES_FILE, LEDGER_CHANGES_ARCHIVE_FILE, LAST_STATE_FILE]:
+        if os.path.exists(file):
+            shutil.move(file, os.path.join(station_dir, file))
+
+# File paths (for the station selected in this session)
+migrate_legacy_data()
+st.session_state.setdefault("station", DEFAULT_STATION)
+current_station = st.session_state.station
+STATION_DIR = get_station_dir(current_station)
+LEDGER_PATHS = {ledger: os.path.join(STATION_DIR, file) for ledger, file in LEDGER_FILE_NAMES.items()}
+SALES_DATA_PATH = LEDGER_PATHS["sales"]
+PARTY_LEDGER_PATH = LEDGER_PATHS["party_ledger"]
+EMPLOYEE_SHORTAGE_PATH = LEDGER_PATHS["employee_shortage"]
+OWNERS_TRANSACTION_PATH = LEDGER_PATHS["owners_transaction"]
+BANK_STATEMENTS_PATH = LEDGER_PATHS["bank_statements"]
+PARTY_CHEQUES_PATH = LEDGER_PATHS["party_cheques"]
+LEDGER_CHANGES_PATH = os.path.join(STATION_DIR, LEDGER_CHANGES_FILE)
+LEDGER_CHANGES_ARCHIVE_PATH = os.path.join(STATION_DIR, LEDGER_CHANGES_ARCHIVE_FILE)
+LAST_STATE_PATH = os.path.join(STATION_DIR, LAST_STATE_FILE)
+NAME_INDEX_PATH = os.path.join(STATION_DIR, NAME_INDEX_FILE)
+CSV_FILES = [SALES_DATA_PATH, PARTY_LEDGER_PATH, EMPLOYEE_SHORTAGE_PATH, OWNERS_TRANSACTION_PATH, BANK_STATEMENTS_PATH, PARTY_CHEQUES_PATH, LEDGER_CHANGES_PATH, LEDGER_CHANGES_ARCHIVE_PATH]
+LEDGER_CHANGE_COLUMNS = ["change_id", "changed_at", "ledger", "row_id", "action", "values", "previous"]
+COMPACTION_THRESHOLD = 200  # Pending changes before a background compaction runs
+
+# Free-text name columns -> name dictionary kind, and the ledger column holding each kind
+NAME_COLUMNS = {"party_name": "party", "employee_name": "employee", "owner_name": "owner"}
+NAME_LEDGERS = {"party_ledger": "party_name", "party_cheques": "party_name", "employee_shortage": "employee_name", "owners_transaction": "owner_name"}
+MAX_NAME_SUGGESTIONS = 8
+
+# Sales columns
+PETROL_NOZZLES = ["petrol_c3", "petrol_c4", "petrol_a1", "petrol_a2"]
+HSD_NOZZLES = ["hsd_c1", "hsd_c2", "hsd_b1", "hsd_b2"]
+XP_NOZZLES = ["xp_b3", "xp_b4"]
+SALES_NOZZLES = PETROL_NOZZLES + HSD_NOZZLES + XP_NOZZLES
+OPENING_READING_KEYS = {
+    "petrol_c3": "sales_c3_open", "petrol_c4": "sales_c4_open", "petrol_a1": "sales_a1_open", "petrol_a2": "sales_a2_open",
+    "hsd_c1": "sales_hsd_c1_open", "hsd_c2": "sales_hsd_c2_open", "hsd_b1": "sales_hsd_b1_open", "hsd_b2": "sales_hsd_b2_open",
+    "xp_b3": "sales_xp_b3_open", "xp_b4": "sales_xp_b4_open"
+}
+DEFAULT_RATES = {"petrol_rate": 104.62, "hsd_rate": 91.16, "xp_rate": 111.57}
+SALES_STREAM_METRICS = {
+    "petrol_l": [f"{nozzle}_sales" for nozzle in PETROL_NOZZLES], "petrol_r": ["petrol_amount"],
+    "hsd_l": [f"{nozzle}_sales" for nozzle in HSD_NOZZLES], "hsd_r": ["hsd_amount"],
+    "xp_l": [f"{nozzle}_sales" for nozzle in XP_NOZZLES], "xp_r": ["xp_amount"],
+    "oil_r": ["total_oil_amount"], "total_sales": ["total_sales_amount"],
+    "payments": ["paytm_amount", "icici_amount", "fleet_card_amount"], "expenses": ["pump_expenses"],
+    "credit_balance": ["credit_balance"],
+}
+SALES_INPUT_COLUMNS = [f"{nozzle}_{reading}" for nozzle in SALES_NOZZLES for reading in ["open", "close"]] + list(DEFAULT_RATES) + [
+    "paytm_amount", "icici_amount", "fleet_card_amount", "pump_expenses"
+]
+SALES_DERIVED_COLUMNS = [f"{nozzle}_sales" for nozzle in SALES_NOZZLES] + [
+    "petrol_amount", "hsd_amount", "xp_amount", "total_oil_amount", "gross_sales_amount", "total_sales_amount",
+    "cash_in", "cash_out", "net_cash", "credit_balance"
+]
+SALES_COLUMNS = [
+    "id", "date",
+    "petrol_c3_open", "petrol_c3_close", "petrol_c3_sales",
+    "petrol_c4_open", "petrol_c4_close", "petrol_c4_sales",
+    "petrol_a1_open", "petrol_a1_close", "petrol_a1_sales",
+    "petrol_a2_open", "petrol_a2_close", "petrol_a2_sales",
+    "hsd_c1_open", "hsd_c1_close", "hsd_c1_sales",
+    "hsd_c2_open", "hsd_c2_close", "hsd_c2_sales",
+    "hsd_b1_open", "hsd_b1_close", "hsd_b1_sales",
+    "hsd_b2_open", "hsd_b2_close", "hsd_b2_sales",
+    "xp_b3_open", "xp_b3_close", "xp_b3_sales",
+    "xp_b4_open", "xp_b4_close", "xp_b4_sales",
+    "test_b1", "test_b2", "test_b3", "test_b4",
+    "petrol_rate", "hsd_rate", "xp_rate",
+    "petrol_amount", "hsd_amount", "xp_amount",
+    "oil_products", "oil_amounts", "total_oil_amount",
+    "gross_sales_amount", "total_sales_amount",
+    "paytm_amount", "icici_amount", "fleet_card_amount",
+    "pump_expenses", "pump_expenses_remark",
+    "cash_in", "cash_out", "net_cash", "credit_balance"
+]
+
+# Trend chart settings (chart series -> summed sales columns)
+TREND_SALES_METRICS = {
+    "Petrol (L)": ["petrol_c3_sales", "petrol_c4_sales", "petrol_a1_sales", "petrol_a2_sales"],
+    "Diesel (L)": ["hsd_c1_sales", "hsd_c2_sales", "hsd_b1_sales", "hsd_b2_sales"],
+    "XP (L)": ["xp_b3_sales", "xp_b4_sales"],
+    "Sales (₹)": ["total_sales_amount"],
+    "Payments (₹)": ["paytm_amount", "icici_amount", "fleet_card_amount"],
+    "Expenses (₹)": ["pump_expenses"],
+}
+TREND_GRANULARITIES = {"Daily": "D", "Weekly": "W-MON", "Monthly": "MS"}
+TREND_PERIOD_DAYS = {"D": 1, "W-MON": 7, "MS": 30.44}
+TREND_PERIOD_UNITS = {"D": "days", "W-MON": "weeks", "MS": "months"}
+MAX_TREND_POINTS = 400
 
 # Initialize CSVs
 def init_csv():
+    os.makedirs(STATION_DIR, exist_ok=True)
     if not os.path.exists(SALES_DATA_PATH):
-        pd.DataFrame(columns=[
-            "id", "date",
-            "petrol_c3_open", "petrol_c3_close", "petrol_c3_sales",
-            "petrol_c4_open", "petrol_c4_close", "petrol_c4_sales",
-            "petrol_a1_open", "petrol_a1_close", "petrol_a1_sales",
-            "petrol_a2_open", "petrol_a2_close", "petrol_a2_sales",
-            "hsd_c1_open", "hsd_c1_close", "hsd_c1_sales",
-            "hsd_c2_open", "hsd_c2_close", "hsd_c2_sales",
-            "hsd_b1_open", "hsd_b1_close", "hsd_b1_sales",
-            "hsd_b2_open", "hsd_b2_close", "hsd_b2_sales",
-            "xp_b3_open", "xp_b3_close", "xp_b3_sales",
-            "xp_b4_open", "xp_b4_close", "xp_b4_sales",
-            "test_b1", "test_b2", "test_b3", "test_b4",
-            "petrol_rate", "hsd_rate", "xp_rate",
-            "petrol_amount", "hsd_amount", "xp_amount",
-            "oil_products", "oil_amounts", "total_oil_amount",
-            "gross_sales_amount", "total_sales_amount",
-            "paytm_amount", "icici_amount", "fleet_card_amount",
-            "pump_expenses", "pump_expenses_remark",
-            "cash_in", "cash_out", "net_cash", "credit_balance"
-        ]).to_csv(SALES_DATA_PATH, index=False)
+        pd.DataFrame(columns=SALES_COLUMNS).to_csv(SALES_DATA_PATH, index=False)
     if not os.path.exists(PARTY_LEDGER_PATH):
         pd.DataFrame(columns=["id", "date", "party_name", "credit_amount", "debit_amount", "remark"]).to_csv(PARTY_LEDGER_PATH, index=False)
     if not os.path.exists(EMPLOYEE_SHORTAGE_PATH):
@@ -114,11 +231,178 @@ def init_csv():
         pd.DataFrame(columns=["id", "date", "description", "debit", "credit", "balance"]).to_csv(BANK_STATEMENTS_PATH, index=False)
     if not os.path.exists(PARTY_CHEQUES_PATH):
         pd.DataFrame(columns=["id", "date", "party_name", "bank", "cheque_date", "cheque_no", "branch", "amount"]).to_csv(PARTY_CHEQUES_PATH, index=False)
+    for path in [LEDGER_CHANGES_PATH, LEDGER_CHANGES_ARCHIVE_PATH]:
+        if not os.path.exists(path):
+            pd.DataFrame(columns=LEDGER_CHANGE_COLUMNS).to_csv(path, index=False)
+
+# Shared lock for ledger writes and compaction (one per server process)
+@st.cache_resource
+def get_ledger_lock():
+    return threading.RLock()
+
+# Per-thread nesting depth of ledger_write_lock
+@st.cache_resource
+def get_ledger_lock_depth():
+    return threading.local()
+
+# Exclusive ledger write access across threads and processes: the in-process lock plus an advisory
+# file lock on the station directory, so separate server processes never assign the same ids
+@contextmanager
+def ledger_write_lock():
+    depth = get_ledger_lock_depth()
+    with get_ledger_lock():
+        if fcntl is None or getattr(depth, "value", 0):
+            depth.value = getattr(depth, "value", 0) + 1
+            try:
+                yield
+            finally:
+                depth.value -= 1
+            return
+        with open(os.path.join(STATION_DIR, LEDGER_LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            depth.value = 1
+            try:
+                yield
+            finally:
+                depth.value = 0
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+# Load pending ledger changes (cached per change log version)
+@st.cache_data(show_spinner=False)
+def load_ledger_changes(changes_version):
+    try:
+        return pd.read_csv(LEDGER_CHANGES_PATH, dtype={"values": str, "previous": str})
+    except Exception:
+        return pd.DataFrame(columns=LEDGER_CHANGE_COLUMNS)
+
+# Apply change records to a raw ledger frame: latest update wins, tombstones drop the row
+def apply_change_records(df, changes):
+    if changes.empty or df.empty:
+        return df
+    changes = changes.sort_values("change_id")
+    updates = changes[changes["action"] == "update"]
+    if not updates.empty:
+        df = df.reset_index(drop=True).copy()
+        row_positions = dict(zip(df["id"], range(len(df))))
+        for change in updates.itertuples(index=False):
+            position = row_positions.get(change.row_id)
+            if position is None:
+                continue
+            for col, value in json.loads(change.values).items():
+                if col in df.columns:
+                    if value is not None and df[col].dtype != object and isinstance(value, str):
+                        df[col] = df[col].astype(object)
+                    df.iat[position, df.columns.get_loc(col)] = value
+    deleted_ids = changes.loc[changes["action"] == "delete", "row_id"]
+    return df[~df["id"].isin(deleted_ids)]
+
+# Apply pending changes for one ledger at read time
+def apply_ledger_changes(df, ledger):
+    changes = load_ledger_changes(get_data_version(LEDGER_CHANGES_PATH))
+    return apply_change_records(df, changes[changes["ledger"] == ledger])
+
+# Append edit/delete records to the change log (O(1) per change)
+def record_ledger_changes(ledger, action, rows):
+    with ledger_write_lock():
+        changes = load_ledger_changes(get_data_version(LEDGER_CHANGES_PATH))
+        next_change_id = int(changes["change_id"].max()) + 1 if not changes.empty else 1
+        changed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        records = pd.DataFrame([
+            {
+                "change_id": next_change_id + i, "changed_at": changed_at, "ledger": ledger,
+                "row_id": row_id, "action": action,
+                "values": json.dumps(values, default=str), "previous": json.dumps(previous, default=str)
+            }
+            for i, (row_id, values, previous) in enumerate(rows)
+        ], columns=LEDGER_CHANGE_COLUMNS)
+        records.to_csv(LEDGER_CHANGES_PATH, mode="a", header=False, index=False)
+    if ledger == "sales":
+        rebuild_last_state()
+    if len(changes) + len(records) >= COMPACTION_THRESHOLD:
+        start_background_compaction()
+    return len(records)
+
+# Edit a ledger row by recording a superseding version of its fields
+def update_ledger_row(ledger, row_id, values, previous):
+    return record_ledger_changes(ledger, "update", [(row_id, values, previous)])
+
+# Delete ledger rows by recording tombstones
+def delete_ledger_rows(ledger, rows_df):
+    rows = [(row["id"], {}, row.drop(labels=["Date"], errors="ignore").to_dict()) for _, row in rows_df.iterrows()]
+    return record_ledger_changes(ledger, "delete", rows) if rows else 0
+
+# Rewrite ledger files with pending changes applied and archive the change log
+def compact_ledgers():
+    with ledger_write_lock():
+        try:
+            changes = pd.read_csv(LEDGER_CHANGES_PATH, dtype={"values": str, "previous": str})
+        except Exception:
+            return 0
+        if changes.empty:
+            return 0
+        for ledger in changes["ledger"].unique():
+            path = LEDGER_PATHS[ledger]
+            df = apply_change_records(pd.read_csv(path), changes[changes["ledger"] == ledger])
+            temp_path = f"{path}.tmp"
+            df.to_csv(temp_path, index=False)
+            os.replace(temp_path, path)
+        changes.to_csv(LEDGER_CHANGES_ARCHIVE_PATH, mode="a", header=not os.path.exists(LEDGER_CHANGES_ARCHIVE_PATH), index=False)
+        pd.DataFrame(columns=LEDGER_CHANGE_COLUMNS).to_csv(LEDGER_CHANGES_PATH, index=False)
+        return len(changes)
+
+# Run compaction on a background thread, at most one at a time
+def start_background_compaction():
+    if any(thread.name == "ledger-compaction" for thread in threading.enumerate()):
+        return
+    threading.Thread(target=compact_ledgers, name="ledger-compaction", daemon=True).start()
+
+# Highest id ever assigned in a ledger: ids still in the file and ids of rows that compaction removed
+# (their change records stay in the archive), so a deleted id is never handed out again
+def ledger_id_high_water(ledger, existing_ids):
+    high_water = int(existing_ids.max()) if not existing_ids.empty else 0
+    if os.path.exists(LEDGER_CHANGES_ARCHIVE_PATH):
+        archived = pd.read_csv(LEDGER_CHANGES_ARCHIVE_PATH, usecols=["ledger", "row_id"])
+        archived_ids = archived.loc[archived["ledger"] == ledger, "row_id"]
+        if not archived_ids.empty:
+            high_water = max(high_water, int(archived_ids.max()))
+    return high_water
+
+# Append new rows to a ledger file, assigning ids above the ledger's high-water mark
+def append_ledger_row(ledger, new_row):
+    path = LEDGER_PATHS[ledger]
+    with ledger_write_lock():
+        existing_ids = pd.read_csv(path, usecols=["id"])["id"]
+        new_id = ledger_id_high_water(ledger, existing_ids) + 1
+        new_row.insert(0, "id", range(new_id, new_id + len(new_row)))
+        header = list(pd.read_csv(path, nrows=0).columns)
+        if set(header) == set(new_row.columns):
+            new_row[header].to_csv(path, mode="a", header=False, index=False)
+        else:
+            # Older file layout: rewrite once with the current columns
+            df = pd.concat([pd.read_csv(path), new_row], ignore_index=True)
+            df.to_csv(path, index=False)
+        return len(existing_ids) + len(new_row)
+
+# Rewrite legacy dd/mm/yyyy bank statement dates as ISO, the format new imports are saved in.
+# A column with both formats would make pd.to_datetime drop one of them
+def migrate_bank_statement_dates():
+    with ledger_write_lock():
+        dates = pd.read_csv(BANK_STATEMENTS_PATH, usecols=["date"], dtype=str)["date"]
+        legacy = dates.str.fullmatch(r"\d{1,2}/\d{1,2}/\d{4}", na=False)
+        if not legacy.any():
+            return 0
+        df = pd.read_csv(BANK_STATEMENTS_PATH, dtype={"date": str})
+        iso_dates = pd.to_datetime(dates[legacy], format="%d/%m/%Y", errors='coerce').dt.strftime("%Y-%m-%d")
+        df.loc[legacy.values, "date"] = iso_dates.fillna(dates[legacy]).values
+        temp_path = f"{BANK_STATEMENTS_PATH}.tmp"
+        df.to_csv(temp_path, index=False)
+        os.replace(temp_path, BANK_STATEMENTS_PATH)
+        return int(legacy.sum())
 
 # Load Sales Data
 def load_sales_data():
     try:
-        df = pd.read_csv(SALES_DATA_PATH)
+        df = apply_ledger_changes(pd.read_csv(SALES_DATA_PATH), "sales")
         df["Date"] = pd.to_datetime(df["date"], errors='coerce')
         required_columns = ["cash_in", "cash_out", "net_cash", "credit_balance", "oil_products", "oil_amounts", "total_oil_amount"]
         for col in required_columns:
@@ -127,32 +411,12 @@ def load_sales_data():
         return df
     except Exception as e:
         st.error(f"Sales Load Error: {str(e)}")
-        return pd.DataFrame(columns=[
-            "id", "date",
-            "petrol_c3_open", "petrol_c3_close", "petrol_c3_sales",
-            "petrol_c4_open", "petrol_c4_close", "petrol_c4_sales",
-            "petrol_a1_open", "petrol_a1_close", "petrol_a1_sales",
-            "petrol_a2_open", "petrol_a2_close", "petrol_a2_sales",
-            "hsd_c1_open", "hsd_c1_close", "hsd_c1_sales",
-            "hsd_c2_open", "hsd_c2_close", "hsd_c2_sales",
-            "hsd_b1_open", "hsd_b1_close", "hsd_b1_sales",
-            "hsd_b2_open", "hsd_b2_close", "hsd_b2_sales",
-            "xp_b3_open", "xp_b3_close", "xp_b3_sales",
-            "xp_b4_open", "xp_b4_close", "xp_b4_sales",
-            "test_b1", "test_b2", "test_b3", "test_b4",
-            "petrol_rate", "hsd_rate", "xp_rate",
-            "petrol_amount", "hsd_amount", "xp_amount",
-            "oil_products", "oil_amounts", "total_oil_amount",
-            "gross_sales_amount", "total_sales_amount",
-            "paytm_amount", "icici_amount", "fleet_card_amount",
-            "pump_expenses", "pump_expenses_remark",
-            "cash_in", "cash_out", "net_cash", "credit_balance", "Date"
-        ])
+        return pd.DataFrame(columns=SALES_COLUMNS + ["Date"])
 
 # Load Party Ledger
 def load_party_ledger():
     try:
-        df = pd.read_csv(PARTY_LEDGER_PATH)
+        df = apply_ledger_changes(pd.read_csv(PARTY_LEDGER_PATH), "party_ledger")
         df["Date"] = pd.to_datetime(df["date"], errors='coerce')
         if "remark" not in df.columns:
             df["remark"] = ""
@@ -164,7 +428,7 @@ def load_party_ledger():
 # Load Employee Shortage
 def load_employee_shortage():
     try:
-        df = pd.read_csv(EMPLOYEE_SHORTAGE_PATH)
+        df = apply_ledger_changes(pd.read_csv(EMPLOYEE_SHORTAGE_PATH), "employee_shortage")
         df["Date"] = pd.to_datetime(df["date"], errors='coerce')
         return df
     except Exception as e:
@@ -174,7 +438,7 @@ def load_employee_shortage():
 # Load Owner's Transactions
 def load_owners_transactions():
     try:
-        df = pd.read_csv(OWNERS_TRANSACTION_PATH)
+        df = apply_ledger_changes(pd.read_csv(OWNERS_TRANSACTION_PATH), "owners_transaction")
         df["Date"] = pd.to_datetime(df["date"], errors='coerce')
         return df
     except Exception as e:
@@ -184,7 +448,7 @@ def load_owners_transactions():
 # Load Bank Statements
 def load_bank_statements():
     try:
-        df = pd.read_csv(BANK_STATEMENTS_PATH)
+        df = apply_ledger_changes(pd.read_csv(BANK_STATEMENTS_PATH), "bank_statements")
         df["Date"] = pd.to_datetime(df["date"], errors='coerce')
         return df
     except Exception as e:
@@ -194,7 +458,7 @@ def load_bank_statements():
 # Load Party Cheques
 def load_party_cheques():
     try:
-        df = pd.read_csv(PARTY_CHEQUES_PATH)
+        df = apply_ledger_changes(pd.read_csv(PARTY_CHEQUES_PATH), "party_cheques")
         df["Date"] = pd.to_datetime(df["date"], errors='coerce')
         df["cheque_date"] = pd.to_datetime(df["cheque_date"], errors='coerce')
         return df
@@ -202,164 +466,430 @@ def load_party_cheques():
         st.error(f"Party Cheques Load Error: {str(e)}")
         return pd.DataFrame(columns=["id", "date", "party_name", "bank", "cheque_date", "cheque_no", "branch", "amount", "Date"])
 
+# Derive the computed sales columns (works on a dict of scalars or a DataFrame)
+def compute_sales_derived(values):
+    derived = {}
+    for nozzle in SALES_NOZZLES:
+        derived[f"{nozzle}_sales"] = values[f"{nozzle}_close"] - values[f"{nozzle}_open"]
+    derived["petrol_amount"] = sum(derived[f"{nozzle}_sales"] for nozzle in PETROL_NOZZLES) * values["petrol_rate"]
+    derived["hsd_amount"] = sum(derived[f"{nozzle}_sales"] for nozzle in HSD_NOZZLES) * values["hsd_rate"]
+    derived["xp_amount"] = sum(derived[f"{nozzle}_sales"] for nozzle in XP_NOZZLES) * values["xp_rate"]
+
+    derived["gross_sales_amount"] = derived["petrol_amount"] + derived["hsd_amount"] + derived["xp_amount"] + values["total_oil_amount"]
+    derived["total_sales_amount"] = derived["gross_sales_amount"] - (values["paytm_amount"] + values["icici_amount"] + values["fleet_card_amount"] + values["pump_expenses"])
+
+    derived["cash_in"] = values["paytm_amount"] + values["icici_amount"] + values["fleet_card_amount"]
+    derived["cash_out"] = values["pump_expenses"]
+    derived["net_cash"] = derived["cash_in"] - derived["cash_out"]
+    derived["credit_balance"] = derived["total_sales_amount"] - derived["cash_in"]
+    return derived
+
+# Re-derive every computed sales column for a frame in one vectorized pass
+def recompute_sales_columns(df, rate_overrides=None):
+    recomputed = df.copy()
+    for rate, value in (rate_overrides or {}).items():
+        recomputed[rate] = value
+    oil_amounts = recomputed["oil_amounts"].fillna("").astype(str)
+    has_oil = oil_amounts.str.strip() != ""
+    if has_oil.any():
+        oil_totals = pd.to_numeric(oil_amounts[has_oil].str.split(";").explode(), errors='coerce').groupby(level=0).sum()
+        recomputed.loc[has_oil, "total_oil_amount"] = oil_totals
+    inputs = recomputed[SALES_INPUT_COLUMNS + ["total_oil_amount"]].apply(pd.to_numeric, errors='coerce').fillna(0.0)
+    for col, values in compute_sales_derived(inputs).items():
+        recomputed[col] = values
+    return recomputed
+
+# Flag rows whose stored derived columns differ from the recomputed values
+def check_sales_consistency(df, rate_overrides=None, tolerance=0.01):
+    recomputed = recompute_sales_columns(df, rate_overrides)
+    columns = SALES_DERIVED_COLUMNS + list(rate_overrides or {})
+    stored = df[columns].apply(pd.to_numeric, errors='coerce').fillna(0.0).to_numpy()
+    expected = recomputed[columns].to_numpy(dtype=float)
+    mismatched = abs(stored - expected) > tolerance
+    row_positions, col_positions = mismatched.nonzero()
+    mismatches = pd.DataFrame({
+        "id": df["id"].to_numpy()[row_positions],
+        "date": df["date"].to_numpy()[row_positions],
+        "column": [columns[position] for position in col_positions],
+        "stored": stored[row_positions, col_positions],
+        "recomputed": expected[row_positions, col_positions],
+    })
+    return mismatches, recomputed
+
+# Apply recomputed values for all mismatched rows as one batch of corrections
+def apply_sales_recompute(start_date, end_date, rate_overrides=None):
+    df = load_sales_data()
+    df = df[(df["Date"].dt.date >= start_date) & (df["Date"].dt.date <= end_date)]
+    mismatches, recomputed = check_sales_consistency(df, rate_overrides)
+    if mismatches.empty:
+        return 0
+    stored_by_id = df.set_index("id")
+    recomputed_by_id = recomputed.set_index("id")
+    rows = []
+    for row_id, row_mismatches in mismatches.groupby("id", sort=False):
+        columns = list(row_mismatches["column"])
+        values = {col: float(recomputed_by_id.at[row_id, col]) for col in columns}
+        previous = {col: stored_by_id.at[row_id, col] for col in columns}
+        rows.append((row_id, values, previous))
+    return record_ledger_changes("sales", "update", rows)
+
+# Build the last known state from a sales row
+def sales_row_to_state(row):
+    return {
+        "date": str(pd.to_datetime(row["date"]).date()),
+        "readings": {nozzle: float(row[f"{nozzle}_close"]) for nozzle in SALES_NOZZLES},
+        "rates": {rate: float(row[rate]) for rate in ["petrol_rate", "hsd_rate", "xp_rate"]},
+    }
+
+# Write the last known state atomically
+def write_last_state(state):
+    temp_path = f"{LAST_STATE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(temp_path, LAST_STATE_PATH)
+
+# Rebuild the last known state from the full sales ledger (after corrections, resets or restores)
+def rebuild_last_state():
+    df = load_sales_data().dropna(subset=["Date"])
+    if df.empty:
+        if os.path.exists(LAST_STATE_PATH):
+            os.remove(LAST_STATE_PATH)
+        return {}
+    state = sales_row_to_state(df.sort_values(["Date", "id"]).iloc[-1])
+    write_last_state(state)
+    return state
+
+# Load the last known state (O(1): one small JSON file)
+def load_last_state():
+    if not os.path.exists(LAST_STATE_PATH):
+        return rebuild_last_state()
+    try:
+        with open(LAST_STATE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return rebuild_last_state()
+
+# Update the last known state after a save, unless the entry is older than the stored one
+def update_last_state(row):
+    state = load_last_state()
+    new_state = sales_row_to_state(row)
+    if not state or new_state["date"] >= state["date"]:
+        write_last_state(new_state)
+
+# Prefill opening readings and rates in the Sales tab when the station or entry date changes, after this
+# session's own save, or on request; saves by other sessions never overwrite readings being typed.
+# A station without history starts from zero readings and the default rates
+def prefill_sales_inputs(state, selected_date):
+    prefill_key = (current_station, str(selected_date))
+    if st.session_state.get("sales_prefilled_for") == prefill_key and not st.session_state.pop("sales_prefill_requested", False):
+        return
+    readings = state["readings"] if state else {}
+    rates = state["rates"] if state else {}
+    for nozzle, key in OPENING_READING_KEYS.items():
+        # Closing starts at the opening so it never falls below its min_value
+        st.session_state[key] = st.session_state[key.replace("_open", "_close")] = readings.get(nozzle, 0.0)
+    for rate, default_rate in DEFAULT_RATES.items():
+        st.session_state[f"sales_{rate}"] = rates.get(rate, default_rate)
+    st.session_state["sales_prefilled_for"] = prefill_key
+    st.session_state["sales_prefilled_from"] = state
+
+# Ask for the Sales tab to be prefilled from the latest state on the next run
+def request_sales_prefill():
+    st.session_state["sales_prefill_requested"] = True
+
+# Compare entered opening readings against the last known closing readings
+def check_opening_readings(state, selected_date, opening_readings):
+    warnings = []
+    if not state:
+        return warnings
+    last_date = date.fromisoformat(state["date"])
+    gap_days = (selected_date - last_date).days
+    if gap_days == 0:
+        warnings.append(f"Sales for {selected_date} are already saved; prefilled readings are that entry's closing readings.")
+    elif gap_days < 0:
+        warnings.append(f"Last sales entry is dated {last_date}; prefilled readings may not apply to {selected_date}.")
+    elif gap_days > 1:
+        warnings.append(f"No sales recorded for {gap_days - 1} day(s) between {last_date} and {selected_date}.")
+    for nozzle, opening in opening_readings.items():
+        last_close = state["readings"].get(nozzle)
+        if last_close is None:
+            continue
+        if opening < last_close:
+            warnings.append(f"{nozzle.upper()} opening {opening:.1f} is below last closing {last_close:.1f} (meter reset?).")
+        elif opening > last_close:
+            warnings.append(f"{nozzle.upper()} opening {opening:.1f} is above last closing {last_close:.1f} ({opening - last_close:.1f} L unaccounted).")
+    return warnings
+
+# Normalize a free-text name for matching: case, spacing, punctuation and symbols (except "&") are ignored.
+# Combining marks are kept, so Devanagari vowel signs and viramas still tell names apart; format characters
+# such as zero-width joiners are dropped without splitting the word
+def normalize_name(name):
+    if pd.isna(name):
+        return ""
+    chars = []
+    for char in unicodedata.normalize("NFKC", str(name)).casefold():
+        category = unicodedata.category(char)
+        if category == "Cf":
+            continue
+        chars.append(" " if char != "&" and category[0] in "PSZC" else char)
+    return " ".join("".join(chars).split())
+
+# Write a station's name dictionary atomically
+def write_name_index(station, names):
+    path = os.path.join(get_station_dir(station), NAME_INDEX_FILE)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(names, f)
+    os.replace(temp_path, path)
+
+# Rebuild a station's name dictionary from its ledgers; the most frequent spelling of each name is canonical
+# (ties go to the spelling seen first)
+def rebuild_name_index(station):
+    spelling_counts = {kind: {} for kind in set(NAME_COLUMNS.values())}
+    for ledger, column in NAME_LEDGERS.items():
+        seen = spelling_counts[NAME_COLUMNS[column]]
+        for chunk in stream_ledger_chunks(station, ledger, [column]):
+            for name, count in chunk[column].dropna().astype(str).value_counts(sort=False).items():
+                spellings = seen.setdefault(normalize_name(name), {})
+                spelling = " ".join(name.split())
+                spellings[spelling] = spellings.get(spelling, 0) + count
+    names = {
+        kind: [max(spellings, key=spellings.get) for normalized, spellings in seen.items() if normalized]
+        for kind, seen in spelling_counts.items()
+    }
+    write_name_index(station, names)
+    return names
+
+# Build the in-memory name index (cached per dictionary version): key = position in the stored list + 1,
+# normalized name -> key, and word prefix -> keys in key order
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_name_index(station, index_version):
+    try:
+        with open(os.path.join(get_station_dir(station), NAME_INDEX_FILE)) as f:
+            names = json.load(f)
+    except (OSError, ValueError):
+        names = rebuild_name_index(station)
+    index = {}
+    for kind in set(NAME_COLUMNS.values()):
+        by_normalized, prefixes = {}, {}
+        for key, name in enumerate(names.get(kind, []), start=1):
+            normalized = normalize_name(name)
+            by_normalized.setdefault(normalized, key)
+            for word in set(normalized.split()):
+                for length in range(1, len(word) + 1):
+                    prefixes.setdefault(word[:length], []).append(key)
+        index[kind] = {"names": names.get(kind, []), "by_normalized": by_normalized, "prefixes": prefixes}
+    return index
+
+# Name index for a station (defaults to the current one), rebuilt from the ledgers if missing
+def get_name_index(station=None):
+    station = station or current_station
+    path = os.path.join(get_station_dir(station), NAME_INDEX_FILE)
+    if not os.path.exists(path):
+        with get_ledger_lock():
+            if not os.path.exists(path):
+                rebuild_name_index(station)
+    return load_name_index(station, os.path.getmtime(path))
+
+# Add new names to the current station's dictionary; returns the canonical spelling of each
+def register_names(kind, names):
+    with ledger_write_lock():
+        index = get_name_index()
+        stored = list(index[kind]["names"])
+        by_normalized = dict(index[kind]["by_normalized"])
+        canonical = []
+        for name in names:
+            normalized = normalize_name(name)
+            if not normalized:
+                canonical.append(name)
+                continue
+            if normalized not in by_normalized:
+                stored.append(" ".join(str(name).split()))
+                by_normalized[normalized] = len(stored)
+            canonical.append(stored[by_normalized[normalized] - 1])
+        if len(stored) > len(index[kind]["names"]):
+            write_name_index(current_station, dict({other: entry["names"] for other, entry in index.items()}, **{kind: stored}))
+        return canonical
+
+# Autocomplete: names whose words start with every typed word, exact match first (prefix index lookup)
+def suggest_names(kind, text, limit=MAX_NAME_SUGGESTIONS):
+    entry = get_name_index()[kind]
+    words = normalize_name(text).split()
+    if not words:
+        return []
+    candidates = sorted((entry["prefixes"].get(word, []) for word in words), key=len)
+    others = [set(keys) for keys in candidates[1:]]
+    exact = entry["by_normalized"].get(" ".join(words))
+    keys = [exact] if exact else []
+    for key in candidates[0]:
+        if len(keys) >= limit:
+            break
+        if key != exact and all(key in other for other in others):
+            keys.append(key)
+    return [entry["names"][key - 1] for key in keys]
+
+# Map stored names to canonical integer keys (blank names get <NA> and drop out of groupbys). Names missing
+# from the dictionary get negative keys, recorded in `unknown` (normalized name -> (key, spelling)) so that
+# several frames or chunks share them
+def encode_names(kind, names, index, unknown):
+    lookup = index[kind]["by_normalized"]
+    names = names.fillna("").astype(str)
+    mapping = {}
+    for name in names.unique():
+        normalized = normalize_name(name)
+        key = lookup.get(normalized)
+        if not normalized:
+            key = pd.NA
+        elif key is None:
+            key = unknown.setdefault(normalized, (-(len(unknown) + 1), " ".join(name.split())))[0]
+        mapping[name] = key
+    return names.map(mapping).astype("Int64")
+
+# Canonical display name for each key
+def decode_names(kind, keys, index, unknown):
+    unknown_names = dict(unknown.values())
+    return [index[kind]["names"][int(key) - 1] if key > 0 else unknown_names[int(key)] for key in keys]
+
+# Name input with suggestions from the name dictionary; returns the name to save
+def name_input(label, kind, key):
+    typed = st.text_input(label, key=key)
+    suggestions = suggest_names(kind, typed)
+    if not suggestions:
+        return typed
+    if normalize_name(suggestions[0]) == normalize_name(typed):
+        if suggestions[0] != typed.strip():
+            st.caption(f"Will be saved as existing name: {suggestions[0]}")
+        return suggestions[0]
+    return st.selectbox(f"Matching {kind} names", [typed] + suggestions, format_func=lambda name: f"{name} (new)" if name == typed else name, key=f"{key}_match")
+
 # Save Sales Data
 def save_sales_data(selected_date, data_dict):
-    df = load_sales_data()
-    new_id = df["id"].max() + 1 if not df.empty else 1
-    
-    petrol_c3_sales = data_dict["petrol_c3_close"] - data_dict["petrol_c3_open"]
-    petrol_c4_sales = data_dict["petrol_c4_close"] - data_dict["petrol_c4_open"]
-    petrol_a1_sales = data_dict["petrol_a1_close"] - data_dict["petrol_a1_open"]
-    petrol_a2_sales = data_dict["petrol_a2_close"] - data_dict["petrol_a2_open"]
-    hsd_c1_sales = data_dict["hsd_c1_close"] - data_dict["hsd_c1_open"]
-    hsd_c2_sales = data_dict["hsd_c2_close"] - data_dict["hsd_c2_open"]
-    hsd_b1_sales = data_dict["hsd_b1_close"] - data_dict["hsd_b1_open"]
-    hsd_b2_sales = data_dict["hsd_b2_close"] - data_dict["hsd_b2_open"]
-    xp_b3_sales = data_dict["xp_b3_close"] - data_dict["xp_b3_open"]
-    xp_b4_sales = data_dict["xp_b4_close"] - data_dict["xp_b4_open"]
-    
-    petrol_amount = (petrol_c3_sales + petrol_c4_sales + petrol_a1_sales + petrol_a2_sales) * data_dict["petrol_rate"]
-    hsd_amount = (hsd_c1_sales + hsd_c2_sales + hsd_b1_sales + hsd_b2_sales) * data_dict["hsd_rate"]
-    xp_amount = (xp_b3_sales + xp_b4_sales) * data_dict["xp_rate"]
-    
     oil_products = ";".join(data_dict["oil_products"]) if data_dict["oil_products"] else ""
     oil_amounts = ";".join([str(amt) for amt in data_dict["oil_amounts"]]) if data_dict["oil_amounts"] else ""
     total_oil_amount = sum(data_dict["oil_amounts"]) if data_dict["oil_amounts"] else 0.0
-    
-    gross_sales_amount = petrol_amount + hsd_amount + xp_amount + total_oil_amount
-    total_sales_amount = gross_sales_amount - (data_dict["paytm_amount"] + data_dict["icici_amount"] + data_dict["fleet_card_amount"] + data_dict["pump_expenses"])
-    
-    cash_in = data_dict["paytm_amount"] + data_dict["icici_amount"] + data_dict["fleet_card_amount"]
-    cash_out = data_dict["pump_expenses"]
-    net_cash = cash_in - cash_out
-    credit_balance = total_sales_amount - cash_in
-    
-    new_row = pd.DataFrame({
-        "id": [new_id], "date": [str(selected_date)],
-        "petrol_c3_open": [data_dict["petrol_c3_open"]], "petrol_c3_close": [data_dict["petrol_c3_close"]], "petrol_c3_sales": [petrol_c3_sales],
-        "petrol_c4_open": [data_dict["petrol_c4_open"]], "petrol_c4_close": [data_dict["petrol_c4_close"]], "petrol_c4_sales": [petrol_c4_sales],
-        "petrol_a1_open": [data_dict["petrol_a1_open"]], "petrol_a1_close": [data_dict["petrol_a1_close"]], "petrol_a1_sales": [petrol_a1_sales],
-        "petrol_a2_open": [data_dict["petrol_a2_open"]], "petrol_a2_close": [data_dict["petrol_a2_close"]], "petrol_a2_sales": [petrol_a2_sales],
-        "hsd_c1_open": [data_dict["hsd_c1_open"]], "hsd_c1_close": [data_dict["hsd_c1_close"]], "hsd_c1_sales": [hsd_c1_sales],
-        "hsd_c2_open": [data_dict["hsd_c2_open"]], "hsd_c2_close": [data_dict["hsd_c2_close"]], "hsd_c2_sales": [hsd_c2_sales],
-        "hsd_b1_open": [data_dict["hsd_b1_open"]], "hsd_b1_close": [data_dict["hsd_b1_close"]], "hsd_b1_sales": [hsd_b1_sales],
-        "hsd_b2_open": [data_dict["hsd_b2_open"]], "hsd_b2_close": [data_dict["hsd_b2_close"]], "hsd_b2_sales": [hsd_b2_sales],
-        "xp_b3_open": [data_dict["xp_b3_open"]], "xp_b3_close": [data_dict["xp_b3_close"]], "xp_b3_sales": [xp_b3_sales],
-        "xp_b4_open": [data_dict["xp_b4_open"]], "xp_b4_close": [data_dict["xp_b4_close"]], "xp_b4_sales": [xp_b4_sales],
-        "test_b1": [data_dict["test_b1"]], "test_b2": [data_dict["test_b2"]],
-        "test_b3": [data_dict["test_b3"]], "test_b4": [data_dict["test_b4"]],
-        "petrol_rate": [data_dict["petrol_rate"]], "hsd_rate": [data_dict["hsd_rate"]], "xp_rate": [data_dict["xp_rate"]],
-        "petrol_amount": [petrol_amount], "hsd_amount": [hsd_amount], "xp_amount": [xp_amount],
-        "oil_products": [oil_products], "oil_amounts": [oil_amounts], "total_oil_amount": [total_oil_amount],
-        "gross_sales_amount": [gross_sales_amount], "total_sales_amount": [total_sales_amount],
-        "paytm_amount": [data_dict["paytm_amount"]], "icici_amount": [data_dict["icici_amount"]],
-        "fleet_card_amount": [data_dict["fleet_card_amount"]], "pump_expenses": [data_dict["pump_expenses"]],
-        "pump_expenses_remark": [data_dict["pump_expenses_remark"]],
-        "cash_in": [cash_in], "cash_out": [cash_out], "net_cash": [net_cash], "credit_balance": [credit_balance]
-    })
-    df = pd.concat([df.drop(columns=["Date"]), new_row], ignore_index=True)
-    df.to_csv(SALES_DATA_PATH, index=False)
-    st.sidebar.success(f"Saved Sales for {selected_date}! Rows now: {len(df)}")
+
+    row = dict(data_dict, date=str(selected_date), oil_products=oil_products, oil_amounts=oil_amounts, total_oil_amount=total_oil_amount)
+    row.update(compute_sales_derived(row))
+    new_row = pd.DataFrame([{col: row[col] for col in SALES_COLUMNS if col != "id"}])
+    num_rows = append_ledger_row("sales", new_row)
+    update_last_state(row)
+    # Rerun so this session's inputs roll over to the readings just saved
+    st.session_state["sales_saved_notice"] = f"Saved Sales for {selected_date}! Rows now: {num_rows}"
+    request_sales_prefill()
+    st.rerun()
 
 # Save Party Ledger Entry
 def save_party_ledger(selected_date, party_name, credit_amount, debit_amount, remark):
-    df = load_party_ledger()
-    new_id = df["id"].max() + 1 if not df.empty else 1
+    party_name = register_names("party", [party_name])[0]
     new_row = pd.DataFrame({
-        "id": [new_id], "date": [str(selected_date)],
+        "date": [str(selected_date)],
         "party_name": [party_name], "credit_amount": [credit_amount], "debit_amount": [debit_amount], "remark": [remark]
     })
-    df = pd.concat([df.drop(columns=["Date"]), new_row], ignore_index=True)
-    df.to_csv(PARTY_LEDGER_PATH, index=False)
-    st.sidebar.success(f"Saved Party Ledger for {selected_date}! Rows now: {len(df)}")
+    num_rows = append_ledger_row("party_ledger", new_row)
+    st.sidebar.success(f"Saved Party Ledger for {selected_date}! Rows now: {num_rows}")
 
 # Save Employee Shortage
 def save_employee_shortage(selected_date, employee_name, shortage_amount):
-    df = load_employee_shortage()
-    new_id = df["id"].max() + 1 if not df.empty else 1
+    employee_name = register_names("employee", [employee_name])[0]
     new_row = pd.DataFrame({
-        "id": [new_id], "date": [str(selected_date)],
+        "date": [str(selected_date)],
         "employee_name": [employee_name], "shortage_amount": [shortage_amount]
     })
-    df = pd.concat([df.drop(columns=["Date"]), new_row], ignore_index=True)
-    df.to_csv(EMPLOYEE_SHORTAGE_PATH, index=False)
-    st.sidebar.success(f"Saved Employee Shortage for {selected_date}! Rows now: {len(df)}")
+    num_rows = append_ledger_row("employee_shortage", new_row)
+    st.sidebar.success(f"Saved Employee Shortage for {selected_date}! Rows now: {num_rows}")
 
 # Save Owner's Transaction
 def save_owners_transaction(selected_date, owner_name, amount, mode, transaction_type):
-    df = load_owners_transactions()
-    new_id = df["id"].max() + 1 if not df.empty else 1
+    owner_name = register_names("owner", [owner_name])[0]
     new_row = pd.DataFrame({
-        "id": [new_id], "date": [str(selected_date)],
+        "date": [str(selected_date)],
         "owner_name": [owner_name], "amount": [amount], "mode": [mode], "type": [transaction_type]
     })
-    df = pd.concat([df.drop(columns=["Date"]), new_row], ignore_index=True)
-    df.to_csv(OWNERS_TRANSACTION_PATH, index=False)
-    st.sidebar.success(f"Saved Owner's Transaction for {selected_date}! Rows now: {len(df)}")
+    num_rows = append_ledger_row("owners_transaction", new_row)
+    st.sidebar.success(f"Saved Owner's Transaction for {selected_date}! Rows now: {num_rows}")
 
 # Save Party Cheque Entry
 def save_party_cheque(selected_date, party_name, bank, cheque_date, cheque_no, branch, amount):
-    df = load_party_cheques()
-    new_id = df["id"].max() + 1 if not df.empty else 1
+    party_name = register_names("party", [party_name])[0]
     new_row = pd.DataFrame({
-        "id": [new_id], "date": [str(selected_date)],
+        "date": [str(selected_date)],
         "party_name": [party_name], "bank": [bank], "cheque_date": [str(cheque_date)],
         "cheque_no": [cheque_no], "branch": [branch], "amount": [amount]
     })
-    df = pd.concat([df.drop(columns=["Date"]), new_row], ignore_index=True)
-    df.to_csv(PARTY_CHEQUES_PATH, index=False)
-    st.sidebar.success(f"Saved Cheque Entry for {party_name} on {selected_date}! Rows now: {len(df)}")
+    num_rows = append_ledger_row("party_cheques", new_row)
+    st.sidebar.success(f"Saved Cheque Entry for {party_name} on {selected_date}! Rows now: {num_rows}")
 
 # Extract and Save Bank Statement
-def extract_and_save_bank_statement(pdf_file):
-    transactions = []
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                lines = text.split("\n")
-                for line in lines:
-                    match = re.match(r"(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\d+\.\d{2})$", line.strip())
-                    if match:
-                        date, desc, amount = match.groups()
-                        amount = float(amount)
-                        transactions.append({
-                            "date": date,
-                            "description": desc,
-                            "debit": abs(amount) if amount < 0 else 0.0,
-                            "credit": amount if amount > 0 else 0.0,
-                            "balance": 0.0  # Placeholder
-                        })
-    
+def extract_and_save_bank_statement(pdf_file, parser_name=None):
+    format_name, transactions, num_pages = parse_bank_statement(pdf_file, parser_name)
     if transactions:
-        df = load_bank_statements()
-        new_id = df["id"].max() + 1 if not df.empty else 1
-        new_rows = [dict({"id": new_id + i}, **t) for i, t in enumerate(transactions)]
-        new_df = pd.DataFrame(new_rows)
-        df = pd.concat([df.drop(columns=["Date"], errors='ignore'), new_df], ignore_index=True)
-        df.to_csv(BANK_STATEMENTS_PATH, index=False)
-        return len(transactions)
-    return 0
+        append_ledger_row("bank_statements", pd.DataFrame(transactions))
+    return format_name, len(transactions)
 
 # Delete Sales Data
 def delete_sales_data(start_date, end_date):
     try:
-        df = pd.read_csv(SALES_DATA_PATH)
+        df = load_sales_data()
         if df.empty:
             st.sidebar.write("No sales data to delete")
             return 0
-        df["date"] = pd.to_datetime(df["date"], errors='coerce')
-        mask = (df["date"].dt.date < start_date) | (df["date"].dt.date > end_date)
-        updated_df = df[mask]
-        updated_df.to_csv(SALES_DATA_PATH, index=False)
-        return len(df) - len(updated_df)
+        mask = (df["Date"].dt.date >= start_date) & (df["Date"].dt.date <= end_date)
+        return delete_ledger_rows("sales", df[mask])
     except Exception as e:
         st.sidebar.error(f"Delete Error: {str(e)}")
         return 0
 
+# Ledger registry for the edit/delete panel: name -> (label, editable columns)
+LEDGER_EDITORS = {
+    "sales": ("Sales", ["date"] + [f"{nozzle}_{reading}" for nozzle in SALES_NOZZLES for reading in ["open", "close"]] + [
+        "test_b1", "test_b2", "test_b3", "test_b4", "petrol_rate", "hsd_rate", "xp_rate",
+        "paytm_amount", "icici_amount", "fleet_card_amount", "pump_expenses", "pump_expenses_remark"
+    ]),
+    "party_ledger": ("Party Ledger", ["date", "party_name", "credit_amount", "debit_amount", "remark"]),
+    "employee_shortage": ("Shortage", ["date", "employee_name", "shortage_amount"]),
+    "owners_transaction": ("Owner’s Transaction", ["date", "owner_name", "amount", "mode", "type"]),
+    "bank_statements": ("Bank Statements", ["date", "description", "debit", "credit", "balance"]),
+    "party_cheques": ("Party Cheques", ["date", "party_name", "bank", "cheque_date", "cheque_no", "branch", "amount"]),
+}
+
+# Load one ledger row by id with its pending corrections applied, streaming the file in chunks
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_ledger_row(station, ledger, row_id, data_version):
+    path = os.path.join(get_station_dir(station), LEDGER_FILE_NAMES[ledger])
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["id"])
+    columns = [col for col in pd.read_csv(path, nrows=0).columns if col not in ["id", "date"]]
+    for chunk in stream_ledger_chunks(station, ledger, columns):
+        rows = chunk[chunk["id"] == row_id]
+        if not rows.empty:
+            return rows
+    return pd.DataFrame(columns=["id"])
+
+LEDGER_DATE_COLUMNS = {"date", "cheque_date"}
+LEDGER_TEXT_COLUMNS = {"pump_expenses_remark", "party_name", "remark", "employee_name", "owner_name", "mode", "type", "description", "bank", "cheque_no", "branch"}
+
+# Whether an edit panel value differs from the stored one (numbers compare as floats, dates as days)
+def edit_value_changed(col, value, current):
+    if col in LEDGER_DATE_COLUMNS:
+        current_date = pd.to_datetime(current, errors='coerce')
+        return pd.isna(current_date) or str(value) != str(current_date.date())
+    if col not in LEDGER_TEXT_COLUMNS:
+        return not math.isclose(float(value), float(current) if pd.notna(current) else 0.0, rel_tol=1e-12, abs_tol=1e-9)
+    return str(value) != ("" if pd.isna(current) else str(current))
+
+# Edit a single ledger entry; names are canonicalized and sales edits re-derive the computed columns
+def edit_ledger_entry(ledger, row, values):
+    values = {col: register_names(NAME_COLUMNS[col], [value])[0] if col in NAME_COLUMNS else value for col, value in values.items()}
+    previous = {col: row[col] for col in values}
+    if ledger == "sales":
+        merged = dict(row.drop(labels=["Date"], errors="ignore").to_dict(), **values)
+        values = dict(values, **compute_sales_derived(merged))
+        previous = {col: row[col] for col in values}
+    return update_ledger_row(ledger, row["id"], values, previous)
+
 # Reset All Data
 def reset_all_data():
-    for file in CSV_FILES:
+    for file in CSV_FILES + [LAST_STATE_PATH, NAME_INDEX_PATH]:
         if os.path.exists(file):
             os.remove(file)
     init_csv()
@@ -370,17 +900,19 @@ def reset_all_data():
 # Backup Data
 def backup_data():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"petrol_data_backup_{timestamp}.zip"
+    backup_filename = f"petrol_data_backup_{current_station}_{timestamp}.zip"
     with zipfile.ZipFile(backup_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
         for file in CSV_FILES:
             if os.path.exists(file):
-                zipf.write(file)
+                zipf.write(file, arcname=os.path.basename(file))
     return backup_filename
 
 # Restore Data
 def restore_data(uploaded_file):
     with zipfile.ZipFile(uploaded_file, 'r') as zipf:
-        zipf.extractall()
+        zipf.extractall(STATION_DIR)
+    rebuild_last_state()
+    rebuild_name_index(current_station)
     st.sidebar.success("Data restored successfully!")
     time.sleep(0.5)
     st.rerun()
@@ -451,12 +983,341 @@ def load_and_filter_data(display_start_date, display_end_date):
 
     return filtered_sales_df, filtered_party_df, filtered_shortage_df, filtered_owners_df, filtered_bank_df, filtered_cheques_df, f" ({display_start_date} to {display_end_date})"
 
+# Data version of a ledger file, used as a cache key (pending corrections count as part of every ledger)
+def get_data_version(path, changes_path=None):
+    files = dict.fromkeys([path, changes_path or LEDGER_CHANGES_PATH])
+    return ":".join(f"{file}@{os.path.getmtime(file) if os.path.exists(file) else 0.0}" for file in files)
+
+# Build resampled trend aggregates over the full history (cached per data version, streamed in chunks)
+@st.cache_data(show_spinner=False)
+def compute_trend_aggregates(freq, sales_version, shortage_version):
+    trend_df = pd.DataFrame(columns=list(TREND_SALES_METRICS), index=pd.DatetimeIndex([]), dtype=float)
+    for chunk in stream_ledger_chunks(current_station, "sales", sorted({col for cols in TREND_SALES_METRICS.values() for col in cols})):
+        part = pd.DataFrame({name: chunk[cols].sum(axis=1) for name, cols in TREND_SALES_METRICS.items()}).set_index(chunk["Date"]).astype(float)
+        trend_df = trend_df.add(part.resample(freq, label="left", closed="left").sum(), fill_value=0.0)
+
+    shortage_series = pd.Series(index=pd.DatetimeIndex([]), dtype=float)
+    for chunk in stream_ledger_chunks(current_station, "employee_shortage", ["shortage_amount"]):
+        part = chunk.set_index("Date")["shortage_amount"].astype(float).resample(freq, label="left", closed="left").sum()
+        shortage_series = shortage_series.add(part, fill_value=0.0)
+    trend_df = trend_df.join(shortage_series.rename("Shortages (₹)"), how="outer").fillna(0.0)
+    trend_df.index = pd.DatetimeIndex(trend_df.index)
+    return trend_df.sort_index()
+
+# Pick the finest granularity that keeps the chart under the point budget
+def choose_trend_granularity(start_date, end_date):
+    num_days = (end_date - start_date).days + 1
+    for label, freq in TREND_GRANULARITIES.items():
+        if num_days / TREND_PERIOD_DAYS[freq] <= MAX_TREND_POINTS:
+            return label
+    return list(TREND_GRANULARITIES)[-1]
+
+# Downsample a trend frame by averaging consecutive buckets of rows; returns the frame and the rows per point
+def downsample_trend(trend_df, max_points=MAX_TREND_POINTS):
+    if len(trend_df) <= max_points:
+        return trend_df, 1
+    bucket_size = -(-len(trend_df) // max_points)
+    buckets = pd.Series(range(len(trend_df))) // bucket_size
+    downsampled = trend_df.reset_index(drop=True).groupby(buckets.values).mean()
+    downsampled.index = trend_df.index[::bucket_size][:len(downsampled)]
+    return downsampled, bucket_size
+
+# Load trend data for the display range
+def load_trend_data(start_date, end_date, granularity="Auto"):
+    if granularity == "Auto":
+        granularity = choose_trend_granularity(start_date, end_date)
+    trend_df = compute_trend_aggregates(
+        TREND_GRANULARITIES[granularity],
+        get_data_version(SALES_DATA_PATH),
+        get_data_version(EMPLOYEE_SHORTAGE_PATH)
+    )
+    # Include the bucket that contains the start date, not just buckets labelled after it
+    first_bucket = max(trend_df.index.searchsorted(pd.Timestamp(start_date), side="right") - 1, 0)
+    trend_df = trend_df.iloc[first_bucket:].loc[:pd.Timestamp(end_date)]
+    trend_df, bucket_size = downsample_trend(trend_df)
+    return trend_df, granularity, bucket_size
+
+# Sort and filter a table once per data version, returning row positions
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_table_index(_df, table_key, data_version, sort_column, ascending, filter_text):
+    positions = pd.RangeIndex(len(_df))
+    if filter_text:
+        mask = pd.Series(False, index=_df.index)
+        for col in _df.columns:
+            if pd.api.types.is_string_dtype(_df[col]) or pd.api.types.is_object_dtype(_df[col]):
+                mask |= _df[col].astype(str).str.contains(filter_text, case=False, na=False, regex=False)
+        positions = positions[mask.values]
+    if sort_column:
+        sort_values = _df[sort_column].iloc[positions]
+        order = sort_values.reset_index(drop=True).sort_values(ascending=ascending, kind="stable", na_position="last").index
+        positions = positions[order]
+    return positions.to_numpy()
+
+# Paginated table that only sends the visible page and chosen columns to the browser
+def show_paginated_table(df, table_key, data_version, columns=None, default_columns=None, page_sizes=(25, 50, 100, 250)):
+    columns = columns or list(df.columns)
+    with st.container():
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 2])
+        with col1:
+            visible_columns = st.multiselect("Columns", columns, default=default_columns or columns, key=f"{table_key}_columns")
+        with col2:
+            sort_column = st.selectbox("Sort by", [""] + columns, key=f"{table_key}_sort")
+        with col3:
+            ascending = st.checkbox("Ascending", value=True, key=f"{table_key}_ascending")
+        with col4:
+            filter_text = st.text_input("Filter", value="", key=f"{table_key}_filter")
+
+        positions = compute_table_index(df, table_key, data_version, sort_column, ascending, filter_text.strip())
+        total_rows = len(positions)
+
+        col1, col2, col3 = st.columns([1, 1, 3])
+        with col1:
+            page_size = st.selectbox("Rows per page", list(page_sizes), key=f"{table_key}_page_size")
+        num_pages = max(-(-total_rows // page_size), 1)
+        with col2:
+            page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1, key=f"{table_key}_page")
+        page = min(page, num_pages)
+        start = (page - 1) * page_size
+        with col3:
+            st.caption(f"Showing rows {min(start + 1, total_rows)}–{min(start + page_size, total_rows)} of {total_rows} (page {page} of {num_pages})")
+
+        st.dataframe(df.iloc[positions[start:start + page_size]][visible_columns or columns], hide_index=True)
+
+# Stream one ledger of any station in bounded chunks, reading only the given columns,
+# applying pending corrections per chunk and keeping rows in the date range (all dated rows if no range)
+def stream_ledger_chunks(station, ledger, columns, start_date=None, end_date=None, chunk_rows=STREAM_CHUNK_ROWS):
+    station_dir = get_station_dir(station)
+    path = os.path.join(station_dir, LEDGER_FILE_NAMES[ledger])
+    if not os.path.exists(path):
+        return
+    changes_path = os.path.join(station_dir, LEDGER_CHANGES_FILE)
+    changes = pd.DataFrame(columns=LEDGER_CHANGE_COLUMNS)
+    if os.path.exists(changes_path):
+        changes = pd.read_csv(changes_path, dtype={"values": str, "previous": str})
+        changes = changes[changes["ledger"] == ledger]
+    wanted = ["id", "date"] + columns
+    for chunk in pd.read_csv(path, usecols=lambda col: col in wanted, chunksize=chunk_rows):
+        chunk = apply_change_records(chunk, changes).reindex(columns=wanted, fill_value=0.0)
+        chunk_dates = pd.to_datetime(chunk["date"], errors='coerce')
+        keep = chunk_dates.notna()
+        if start_date is not None:
+            keep &= (chunk_dates >= pd.Timestamp(start_date)) & (chunk_dates < pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        yield chunk.loc[keep].assign(Date=chunk_dates[keep])
+
+# Fold per-chunk group sums into a running total
+def fold_group_sums(total, chunk, by, columns):
+    part = chunk.groupby(by)[columns].sum()
+    return part if total is None else total.add(part, fill_value=0.0)
+
+# Streamed sales totals for the headline metrics
+def stream_sales_totals(station, start_date, end_date):
+    totals = dict.fromkeys(SALES_STREAM_METRICS, 0.0)
+    columns = sorted({col for cols in SALES_STREAM_METRICS.values() for col in cols})
+    for chunk in stream_ledger_chunks(station, "sales", columns, start_date, end_date):
+        for name, cols in SALES_STREAM_METRICS.items():
+            totals[name] += chunk[cols].to_numpy(dtype=float).sum()
+    return totals
+
+# Data version of a whole station partition
+def get_station_version(station, ledgers=("sales", "party_ledger", "employee_shortage")):
+    station_dir = get_station_dir(station)
+    return ":".join(
+        get_data_version(os.path.join(station_dir, LEDGER_FILE_NAMES[ledger]), os.path.join(station_dir, LEDGER_CHANGES_FILE))
+        for ledger in ledgers
+    )
+
+# Headline aggregates for one station over a date range (cached per station data version)
+@st.cache_data(show_spinner=False)
+def compute_station_summary(station, start_date, end_date, station_version):
+    totals = stream_sales_totals(station, start_date, end_date)
+    total_shortage = sum(chunk["shortage_amount"].sum() for chunk in stream_ledger_chunks(station, "employee_shortage", ["shortage_amount"], start_date, end_date))
+    party_net_balance = sum(
+        chunk["credit_amount"].sum() - chunk["debit_amount"].sum()
+        for chunk in stream_ledger_chunks(station, "party_ledger", ["credit_amount", "debit_amount"], start_date, end_date)
+    )
+    return {
+        "Station": station,
+        "Petrol (L)": totals["petrol_l"],
+        "Diesel (L)": totals["hsd_l"],
+        "XP (L)": totals["xp_l"],
+        "Oil (₹)": totals["oil_r"],
+        "Total Sales (₹)": totals["total_sales"],
+        "Payments (₹)": totals["payments"],
+        "Expenses (₹)": totals["expenses"],
+        "Shortage (₹)": total_shortage,
+        "Net Sales (₹)": totals["credit_balance"] + party_net_balance - total_shortage,
+    }
+
+# All dashboard aggregates for a range, folded chunk by chunk (cached per station data version)
+@st.cache_data(show_spinner=False)
+def compute_streaming_aggregates(station, start_date, end_date, station_version):
+    aggregates = {"sales": stream_sales_totals(station, start_date, end_date)}
+    name_index = get_name_index(station)
+
+    # Names are grouped on their canonical integer keys and decoded once at the end
+    party_unknown = {}
+    party_summary = None
+    for chunk in stream_ledger_chunks(station, "party_ledger", ["party_name", "credit_amount", "debit_amount"], start_date, end_date):
+        chunk["party_key"] = encode_names("party", chunk["party_name"], name_index, party_unknown)
+        party_summary = fold_group_sums(party_summary, chunk, "party_key", ["credit_amount", "debit_amount"])
+    cheques_summary = None
+    for chunk in stream_ledger_chunks(station, "party_cheques", ["party_name", "amount"], start_date, end_date):
+        chunk["party_key"] = encode_names("party", chunk["party_name"], name_index, party_unknown)
+        cheques_summary = fold_group_sums(cheques_summary, chunk, "party_key", ["amount"])
+    party_summary = party_summary if party_summary is not None else pd.DataFrame(columns=["credit_amount", "debit_amount"], dtype=float)
+    cheques_summary = cheques_summary if cheques_summary is not None else pd.DataFrame(columns=["amount"], dtype=float)
+    party_summary = party_summary.join(cheques_summary.rename(columns={"amount": "cheque_amount"}), how="outer").fillna(0.0)
+    party_summary["Net Balance"] = party_summary["credit_amount"] - party_summary["debit_amount"] - party_summary["cheque_amount"]
+    party_summary.insert(0, "party_name", decode_names("party", party_summary.index, name_index, party_unknown))
+    aggregates["party_summary"] = party_summary.reset_index(drop=True)
+
+    employee_unknown = {}
+    shortage_summary = None
+    for chunk in stream_ledger_chunks(station, "employee_shortage", ["employee_name", "shortage_amount"], start_date, end_date):
+        chunk["employee_key"] = encode_names("employee", chunk["employee_name"], name_index, employee_unknown)
+        shortage_summary = fold_group_sums(shortage_summary, chunk, "employee_key", ["shortage_amount"])
+    shortage_summary = shortage_summary if shortage_summary is not None else pd.DataFrame(columns=["shortage_amount"], dtype=float)
+    shortage_summary.insert(0, "employee_name", decode_names("employee", shortage_summary.index, name_index, employee_unknown))
+    aggregates["shortage_summary"] = shortage_summary.reset_index(drop=True)
+
+    owner_unknown = {}
+    owners_summary = None
+    for chunk in stream_ledger_chunks(station, "owners_transaction", ["owner_name", "mode", "type", "amount"], start_date, end_date):
+        chunk["owner_key"] = encode_names("owner", chunk["owner_name"], name_index, owner_unknown)
+        owners_summary = fold_group_sums(owners_summary, chunk, ["owner_key", "mode", "type"], ["amount"])
+    if owners_summary is not None:
+        owners_summary = owners_summary.reset_index()
+        owners_summary.insert(0, "owner_name", decode_names("owner", owners_summary.pop("owner_key"), name_index, owner_unknown))
+        aggregates["owners_summary"] = owners_summary
+    else:
+        aggregates["owners_summary"] = pd.DataFrame(columns=["owner_name", "mode", "type", "amount"])
+
+    bank_totals = {"debit": 0.0, "credit": 0.0}
+    for chunk in stream_ledger_chunks(station, "bank_statements", ["debit", "credit"], start_date, end_date):
+        for col in bank_totals:
+            bank_totals[col] += chunk[col].sum()
+    aggregates["bank"] = bank_totals
+    return aggregates
+
+# Consolidated view: per-station aggregates computed in parallel, then merged with a group total
+def compute_group_summary(stations, start_date, end_date):
+    versions = [get_station_version(station) for station in stations]
+    with ThreadPoolExecutor(max_workers=min(MAX_STATION_WORKERS, len(stations))) as executor:
+        summaries = list(executor.map(lambda args: compute_station_summary(*args), [(station, start_date, end_date, version) for station, version in zip(stations, versions)]))
+    group_df = pd.DataFrame(summaries)
+    totals = group_df.drop(columns=["Station"]).sum()
+    totals["Station"] = "Total"
+    return pd.concat([group_df, totals.to_frame().T], ignore_index=True)
+
+# Trend charts for the display range
+def show_trends(start_date, end_date):
+    st.subheader("📉 Trends")
+    granularity = st.selectbox("Granularity", ["Auto"] + list(TREND_GRANULARITIES), key="trend_granularity")
+    trend_df, granularity, bucket_size = load_trend_data(start_date, end_date, granularity)
+    if bucket_size > 1:
+        unit = TREND_PERIOD_UNITS[TREND_GRANULARITIES[granularity]]
+        st.caption(f"Average {granularity.lower()} totals per {bucket_size}-{unit[:-1]} span, {len(trend_df)} points")
+    else:
+        st.caption(f"{granularity} totals, {len(trend_df)} points")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.line_chart(trend_df[["Petrol (L)", "Diesel (L)", "XP (L)"]])
+    with col2:
+        st.line_chart(trend_df[["Sales (₹)", "Payments (₹)", "Expenses (₹)", "Shortages (₹)"]])
+
+# Dashboard for wide ranges, built only from streamed aggregates (no row-level frames)
+def show_streaming_dashboard(aggregates, title_suffix, start_date, end_date):
+    sales = aggregates["sales"]
+    st.info(f"Streaming mode: ranges over {STREAMING_RANGE_DAYS} days show aggregates only. Narrow the range for row-level tables and downloads.")
+
+    st.markdown(f"<h2>📈 Key Metrics{title_suffix}</h2>", unsafe_allow_html=True)
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>⛽ Petrol Sales</span><br><span class='metric-value' style='color: #e74c3c;'>{sales['petrol_l']:.2f} L<br>₹{sales['petrol_r']:.2f}</span></div>", unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>🚛 Diesel Sales</span><br><span class='metric-value' style='color: #e67e22;'>{sales['hsd_l']:.2f} L<br>₹{sales['hsd_r']:.2f}</span></div>", unsafe_allow_html=True)
+    with col3:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>⚡ XP Sales</span><br><span class='metric-value' style='color: #8e44ad;'>{sales['xp_l']:.2f} L<br>₹{sales['xp_r']:.2f}</span></div>", unsafe_allow_html=True)
+    with col4:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>🛢️ Oil Sales</span><br><span class='metric-value' style='color: #16a085;'>₹{sales['oil_r']:.2f}</span></div>", unsafe_allow_html=True)
+    with col5:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>💵 Total Sales (₹)</span><br><span class='metric-value' style='color: #2980b9;'>₹{sales['total_sales']:.2f}</span></div>", unsafe_allow_html=True)
+
+    party_summary = aggregates["party_summary"]
+    shortage_summary = aggregates["shortage_summary"]
+    total_shortage = shortage_summary["shortage_amount"].sum()
+    st.markdown(f"<h2>💰 Cash Flow{title_suffix}</h2>", unsafe_allow_html=True)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>💳 Total Payments Received (₹)</span><br><span class='metric-value' style='color: #27ae60;'>{sales['payments']:.2f}</span></div>", unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>🛠️ Pump Expenses (₹)</span><br><span class='metric-value' style='color: #e67e22;'>{sales['expenses']:.2f}</span></div>", unsafe_allow_html=True)
+    with col3:
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>👷 Total Shortage (₹)</span><br><span class='metric-value' style='color: #e74c3c;'>{total_shortage:.2f}</span></div>", unsafe_allow_html=True)
+    with col4:
+        adjusted_net_sales = sales["credit_balance"] + party_summary["credit_amount"].sum() - party_summary["debit_amount"].sum() - total_shortage
+        color = "#c0392b" if adjusted_net_sales > 0 else "#27ae60"
+        st.markdown(f"<div class='metric-box'><span class='metric-label'>📊 Net Sales (₹)</span><br><span class='metric-value' style='color: {color};'>{adjusted_net_sales:.2f}</span></div>", unsafe_allow_html=True)
+
+    st.markdown(f"<h2>📊 Visualizations{title_suffix}</h2>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Fuel Sales by Type (Liters)")
+        st.bar_chart(pd.DataFrame({"Sales (L)": [sales["petrol_l"], sales["hsd_l"], sales["xp_l"]]}, index=pd.Index(["Petrol", "Diesel", "XP"], name="Fuel Type")))
+    with col2:
+        st.subheader("Sales Breakdown (₹)")
+        st.bar_chart(pd.DataFrame({"Amount (₹)": [sales["petrol_r"], sales["hsd_r"], sales["xp_r"], sales["oil_r"], sales["expenses"]]}, index=pd.Index(["Petrol", "Diesel", "XP", "Oil", "Expenses"], name="Type")))
+    show_trends(start_date, end_date)
+
+    if not party_summary.empty:
+        st.markdown(f"<h2>📒 Party Ledger{title_suffix}</h2>", unsafe_allow_html=True)
+        st.subheader("Party Balances Summary")
+        st.dataframe(party_summary, hide_index=True)
+        st.subheader("Party Net Balance (₹)")
+        st.bar_chart(party_summary[["party_name", "Net Balance"]].set_index("party_name"))
+
+    if not shortage_summary.empty:
+        st.markdown(f"<h2>👷 Employee Shortage{title_suffix}</h2>", unsafe_allow_html=True)
+        st.dataframe(shortage_summary, hide_index=True)
+        st.bar_chart(shortage_summary.set_index("employee_name"))
+
+    owners_summary = aggregates["owners_summary"]
+    if not owners_summary.empty:
+        st.markdown(f"<h2>👑 Owner’s Transactions{title_suffix}</h2>", unsafe_allow_html=True)
+        st.dataframe(owners_summary, hide_index=True)
+        st.bar_chart(owners_summary.pivot_table(index="owner_name", columns="type", values="amount", aggfunc="sum", fill_value=0))
+
+    bank = aggregates["bank"]
+    if bank["debit"] or bank["credit"]:
+        st.markdown(f"<h2>🏦 Bank Statements{title_suffix}</h2>", unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"<div class='metric-box'><span class='metric-label'>📉 Total Debits (₹)</span><br><span class='metric-value' style='color: #e74c3c;'>{bank['debit']:.2f}</span></div>", unsafe_allow_html=True)
+        with col2:
+            st.markdown(f"<div class='metric-box'><span class='metric-label'>📈 Total Credits (₹)</span><br><span class='metric-value' style='color: #27ae60;'>{bank['credit']:.2f}</span></div>", unsafe_allow_html=True)
+        with col3:
+            net_balance = bank["credit"] - bank["debit"]
+            color = "#27ae60" if net_balance >= 0 else "#e74c3c"
+            st.markdown(f"<div class='metric-box'><span class='metric-label'>💰 Net Balance (₹)</span><br><span class='metric-value' style='color: {color};'>{net_balance:.2f}</span></div>", unsafe_allow_html=True)
+
+# Select a newly added station on the next rerun
+def add_station(name_key):
+    station = station_slug(st.session_state[name_key])
+    if station:
+        os.makedirs(get_station_dir(station), exist_ok=True)
+        st.session_state.station = station
+        st.session_state[name_key] = ""
+
 # Main app logic
 if not st.session_state.authenticated:
     show_login_page()
 else:
     init_csv()
-    st.markdown("<h1>⛽ Petrol Pump Dashboard</h1>", unsafe_allow_html=True)
+    bank_version = get_data_version(BANK_STATEMENTS_PATH)
+    if st.session_state.get("bank_dates_checked") != bank_version:
+        migrate_bank_statement_dates()
+        st.session_state.bank_dates_checked = get_data_version(BANK_STATEMENTS_PATH)
+    st.markdown(f"<h1>⛽ Petrol Pump Dashboard — {current_station}</h1>", unsafe_allow_html=True)
 
     # Sidebar
     st.sidebar.header("🔑 User Session")
@@ -464,6 +1325,13 @@ else:
         st.session_state.authenticated = False
         st.rerun()
 
+    st.sidebar.header("🏢 Station")
+    stations = list_stations()
+    st.sidebar.selectbox("Select Station", sorted(set(stations) | {current_station}), key="station")
+    st.sidebar.text_input("New Station Name", key="new_station_name")
+    st.sidebar.button("➕ Add Station", on_click=add_station, args=("new_station_name",))
+    show_group_dashboard = st.sidebar.checkbox("Show Group Dashboard (all stations)", value=False, key="group_view")
+
     st.sidebar.header("📊 Data Entry")
     today = date.today()
     selected_date = st.sidebar.date_input("📅 Select Date for Entry", value=today)
@@ -474,6 +1342,17 @@ else:
 
     # Sales Tab
     with sales_tab:
+        if "sales_saved_notice" in st.session_state:
+            st.success(st.session_state.pop("sales_saved_notice"))
+        last_state = load_last_state()
+        prefill_sales_inputs(last_state, selected_date)
+        prefilled_state = st.session_state.get("sales_prefilled_from")
+        if prefilled_state:
+            st.caption(f"Opening readings and rates prefilled from {prefilled_state['date']}")
+        if last_state and last_state != prefilled_state:
+            st.info(f"Newer readings were saved (latest entry {last_state['date']}). Your inputs were left unchanged.")
+            st.button("🔄 Load Latest Readings", key="load_latest_readings", on_click=request_sales_prefill)
+
         st.subheader("⛽ Petrol Meter Readings (Liters)")
         petrol_c3_open = st.number_input("C3 Opening", min_value=0.0, step=0.1, key="sales_c3_open")
         petrol_c3_close = st.number_input("C3 Closing", min_value=petrol_c3_open, step=0.1, key="sales_c3_close")
@@ -500,6 +1379,10 @@ else:
         xp_b4_open = st.number_input("B4 Opening (XP)", min_value=0.0, step=0.1, key="sales_xp_b4_open")
         xp_b4_close = st.number_input("B4 Closing (XP)", min_value=xp_b4_open, step=0.1, key="sales_xp_b4_close")
 
+        opening_warnings = check_opening_readings(last_state, selected_date, {nozzle: st.session_state[key] for nozzle, key in OPENING_READING_KEYS.items()})
+        for warning in opening_warnings:
+            st.warning(warning)
+
         st.subheader("🧪 Testing (Liters)")
         test_b1 = st.number_input("Test B1", min_value=0.0, step=0.1, value=0.0, key="sales_test_b1")
         test_b2 = st.number_input("Test B2", min_value=0.0, step=0.1, value=0.0, key="sales_test_b2")
@@ -507,9 +1390,9 @@ else:
         test_b4 = st.number_input("Test B4", min_value=0.0, step=0.1, value=0.0, key="sales_test_b4")
 
         st.subheader("💰 Rates (₹/L)")
-        petrol_rate = st.number_input("Petrol Rate", min_value=0.0, step=0.01, value=104.62, key="sales_petrol_rate")
-        hsd_rate = st.number_input("HSD Rate", min_value=0.0, step=0.01, value=91.16, key="sales_hsd_rate")
-        xp_rate = st.number_input("XP Rate", min_value=0.0, step=0.01, value=111.57, key="sales_xp_rate")
+        petrol_rate = st.number_input("Petrol Rate", min_value=0.0, step=0.01, key="sales_petrol_rate")
+        hsd_rate = st.number_input("HSD Rate", min_value=0.0, step=0.01, key="sales_hsd_rate")
+        xp_rate = st.number_input("XP Rate", min_value=0.0, step=0.01, key="sales_xp_rate")
 
         st.subheader("🛢️ Oil Sales (₹)")
         num_oil_products = st.number_input("Number of Oil Products", min_value=0, max_value=10, value=0, step=1, key="sales_num_oil")
@@ -557,7 +1440,7 @@ else:
     # Party Ledger Tab
     with party_tab:
         st.subheader("📒 Party Ledger")
-        party_name = st.text_input("Party Name", key="party_name")
+        party_name = name_input("Party Name", "party", "party_name")
         party_credit = st.number_input("Credit Amount (₹)", min_value=0.0, step=0.1, value=0.0, key="party_credit")
         party_debit = st.number_input("Debit Amount (₹)", min_value=0.0, step=0.1, value=0.0, key="party_debit")
         party_remark = st.text_input("Remark", value="", key="party_remark")
@@ -565,7 +1448,7 @@ else:
             save_party_ledger(selected_date, party_name, party_credit, party_debit, party_remark)
 
         st.subheader("🏦 Party Cheque Entry")
-        cheque_party_name = st.text_input("Party Name (Cheque)", key="cheque_party_name")
+        cheque_party_name = name_input("Party Name (Cheque)", "party", "cheque_party_name")
         cheque_bank = st.text_input("Bank Name", key="cheque_bank")
         cheque_date = st.date_input("Cheque Date", value=today, key="cheque_date")
         cheque_no = st.text_input("Cheque Number", key="cheque_no")
@@ -577,7 +1460,7 @@ else:
     # Employee Shortage Tab
     with shortage_tab:
         st.subheader("👷 Employee Shortage")
-        employee_name = st.text_input("Employee Name", key="shortage_employee")
+        employee_name = name_input("Employee Name", "employee", "shortage_employee")
         shortage_amount = st.number_input("Shortage Amount (₹)", min_value=0.0, step=0.1, value=0.0, key="shortage_amount")
         if st.button("💾 Save Shortage", key="save_shortage"):
             save_employee_shortage(selected_date, employee_name, shortage_amount)
@@ -585,7 +1468,7 @@ else:
     # Owner’s Transaction Tab
     with owner_tab:
         st.subheader("👑 Owner’s Transaction")
-        owner_name = st.text_input("Owner Name", key="owner_name")
+        owner_name = name_input("Owner Name", "owner", "owner_name")
         owner_amount = st.number_input("Amount (₹)", min_value=0.0, step=0.1, value=0.0, key="owner_amount")
         owner_mode = st.selectbox("Mode of Transaction", ["Online", "Cheque", "Cash"], key="owner_mode")
         owner_type = st.selectbox("Type", ["Credit", "Debit"], key="owner_type")
@@ -596,10 +1479,11 @@ else:
     with bank_tab:
         st.subheader("🏦 Bank Statements")
         uploaded_pdf = st.file_uploader("Upload Bank Statement (PDF)", type="pdf", key="bank_pdf")
+        bank_format = st.selectbox("Statement Format", ["Auto-detect"] + parser_names(), key="bank_format")
         if uploaded_pdf and st.button("📤 Process Bank Statement", key="process_bank"):
-            num_transactions = extract_and_save_bank_statement(uploaded_pdf)
+            format_name, num_transactions = extract_and_save_bank_statement(uploaded_pdf, None if bank_format == "Auto-detect" else bank_format)
             if num_transactions > 0:
-                st.sidebar.success(f"Extracted and saved {num_transactions} transactions!")
+                st.sidebar.success(f"Extracted and saved {num_transactions} transactions ({format_name} format)!")
                 time.sleep(0.5)
                 st.rerun()
             else:
@@ -620,6 +1504,98 @@ else:
             else:
                 st.sidebar.write("Please check 'Confirm Deletion' to proceed.")
 
+    st.sidebar.subheader("🧮 Recompute Sales")
+    with st.sidebar.expander("Check and fix derived sales columns"):
+        recompute_range = st.date_input("📅 Recompute Range", value=[today, today], key="recompute_range")
+        override_rates = st.checkbox("Override rates for this range", value=False, key="recompute_override")
+        rate_overrides = {}
+        if override_rates:
+            for rate, default_rate in DEFAULT_RATES.items():
+                rate_overrides[rate] = st.number_input(f"{rate.replace('_', ' ').title()}", min_value=0.0, step=0.01, value=default_rate, key=f"recompute_{rate}")
+        if len(recompute_range) == 2:
+            recompute_start, recompute_end = recompute_range
+            # Corrections can only be applied after previewing them for the same range and rates
+            recompute_params = (current_station, recompute_start, recompute_end, tuple(rate_overrides.items()), get_data_version(SALES_DATA_PATH))
+            if st.button("🔍 Check Consistency", key="check_consistency"):
+                check_df = load_sales_data()
+                check_df = check_df[(check_df["Date"].dt.date >= recompute_start) & (check_df["Date"].dt.date <= recompute_end)]
+                mismatches, _ = check_sales_consistency(check_df, rate_overrides)
+                st.session_state.recompute_preview = (recompute_params, len(check_df), mismatches)
+            preview = st.session_state.get("recompute_preview")
+            if preview and preview[0] == recompute_params:
+                _, num_checked, mismatches = preview
+                if mismatches.empty:
+                    st.success(f"All {num_checked} sales rows are consistent.")
+                else:
+                    st.warning(f"{mismatches['id'].nunique()} of {num_checked} rows differ in {len(mismatches)} values.")
+                    st.dataframe(mismatches, hide_index=True)
+                    confirm_recompute = st.checkbox("Confirm Corrections", value=False, key="confirm_recompute")
+                    if st.button("✅ Apply Corrections", key="apply_recompute"):
+                        if confirm_recompute:
+                            corrected = apply_sales_recompute(recompute_start, recompute_end, rate_overrides)
+                            st.session_state.pop("recompute_preview", None)
+                            st.success(f"Corrected {corrected} sales rows!")
+                            time.sleep(0.5)
+                            st.rerun()
+                        else:
+                            st.write("Please check 'Confirm Corrections' to proceed.")
+            else:
+                st.write("Check consistency to preview corrections before applying them.")
+
+    st.sidebar.subheader("✏️ Edit / Delete Entries")
+    with st.sidebar.expander("Correct a ledger entry"):
+        edit_ledger = st.selectbox("Ledger", list(LEDGER_EDITORS), format_func=lambda name: LEDGER_EDITORS[name][0], key="edit_ledger")
+        edit_label, edit_columns = LEDGER_EDITORS[edit_ledger]
+        edit_row_id = int(st.number_input("Entry ID", min_value=1, step=1, key="edit_row_id", help="Shown in the id column of the data tables"))
+        if st.button("🔍 Load Entry", key="load_edit_entry"):
+            st.session_state.edit_target = (current_station, edit_ledger, edit_row_id)
+        # Only the requested row is read, and only once an entry has been loaded
+        edit_loaded = st.session_state.get("edit_target") == (current_station, edit_ledger, edit_row_id)
+        edit_rows = load_ledger_row(current_station, edit_ledger, edit_row_id, get_data_version(LEDGER_PATHS[edit_ledger])) if edit_loaded else None
+        if not edit_loaded:
+            st.write("Enter an ID and click Load Entry.")
+        elif edit_rows.empty:
+            st.write(f"No {edit_label} entry with ID {edit_row_id}.")
+        else:
+            edit_row = edit_rows.iloc[0]
+            edit_values = {}
+            for col in edit_columns:
+                current = edit_row[col]
+                widget_key = f"edit_{edit_ledger}_{edit_row_id}_{col}"
+                if col in LEDGER_DATE_COLUMNS:
+                    current_date = pd.to_datetime(current, errors='coerce')
+                    edit_values[col] = str(st.date_input(col, value=current_date.date() if pd.notna(current_date) else today, key=widget_key))
+                elif col not in LEDGER_TEXT_COLUMNS:
+                    edit_values[col] = st.number_input(col, value=float(current) if pd.notna(current) else 0.0, step=0.1, key=widget_key)
+                else:
+                    edit_values[col] = st.text_input(col, value="" if pd.isna(current) else str(current), key=widget_key)
+            if st.button("💾 Save Correction", key="save_correction"):
+                changed = {col: value for col, value in edit_values.items() if edit_value_changed(col, value, edit_row[col])}
+                if changed:
+                    edit_ledger_entry(edit_ledger, edit_row, changed)
+                    st.success(f"Corrected {edit_label} entry {edit_row_id}.")
+                    time.sleep(0.5)
+                    st.rerun()
+                else:
+                    st.write("No changes to save.")
+            confirm_entry_delete = st.checkbox("Confirm Entry Deletion", value=False, key="confirm_entry_delete")
+            if st.button("🗑️ Delete Entry", key="delete_entry"):
+                if confirm_entry_delete:
+                    delete_ledger_rows(edit_ledger, edit_rows)
+                    st.success(f"Deleted {edit_label} entry {edit_row_id}.")
+                    time.sleep(0.5)
+                    st.rerun()
+                else:
+                    st.write("Please check 'Confirm Entry Deletion' to proceed.")
+
+    pending_changes = len(load_ledger_changes(get_data_version(LEDGER_CHANGES_PATH)))
+    st.sidebar.write(f"Pending corrections: {pending_changes}")
+    if st.sidebar.button("🧹 Compact Ledgers", disabled=pending_changes == 0):
+        compacted = compact_ledgers()
+        st.sidebar.success(f"Compacted {compacted} corrections into the ledgers!")
+        time.sleep(0.5)
+        st.rerun()
+
     st.sidebar.subheader("🔄 Reset All Data")
     confirm_reset = st.sidebar.checkbox("Confirm Reset (This will delete all data permanently)", value=False)
     if st.sidebar.button("🔄 Reset All Data", type="primary"):
@@ -645,6 +1621,31 @@ else:
     else:
         display_start_date, display_end_date = selected_date, selected_date
 
+    if show_group_dashboard:
+        st.markdown(f"<h2>🏢 Group Dashboard ({display_start_date} to {display_end_date})</h2>", unsafe_allow_html=True)
+        group_df = compute_group_summary(stations, display_start_date, display_end_date)
+        group_totals = group_df.iloc[-1]
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown(f"<div class='metric-box'><span class='metric-label'>🏢 Stations</span><br><span class='metric-value' style='color: #2c3e50;'>{len(stations)}</span></div>", unsafe_allow_html=True)
+        with col2:
+            st.markdown(f"<div class='metric-box'><span class='metric-label'>💵 Group Total Sales (₹)</span><br><span class='metric-value' style='color: #2980b9;'>{group_totals['Total Sales (₹)']:.2f}</span></div>", unsafe_allow_html=True)
+        with col3:
+            st.markdown(f"<div class='metric-box'><span class='metric-label'>📊 Group Net Sales (₹)</span><br><span class='metric-value' style='color: #27ae60;'>{group_totals['Net Sales (₹)']:.2f}</span></div>", unsafe_allow_html=True)
+        st.dataframe(group_df, hide_index=True)
+        st.subheader("Total Sales by Station (₹)")
+        st.bar_chart(group_df.iloc[:-1].set_index("Station")[["Total Sales (₹)"]])
+
+    # Wide ranges: aggregate in bounded chunks instead of loading every ledger
+    streaming_mode = st.sidebar.checkbox(f"Streaming mode for ranges over {STREAMING_RANGE_DAYS} days", value=True, key="streaming_mode")
+    if streaming_mode and (display_end_date - display_start_date).days + 1 > STREAMING_RANGE_DAYS:
+        aggregates = compute_streaming_aggregates(
+            current_station, display_start_date, display_end_date, get_station_version(current_station, tuple(LEDGER_FILE_NAMES))
+        )
+        show_streaming_dashboard(aggregates, f" ({display_start_date} to {display_end_date})", display_start_date, display_end_date)
+        st.markdown("<hr><p style='text-align: center; color: #7f8c8d;'>Chhatrapati Petroleum</p>", unsafe_allow_html=True)
+        st.stop()
+
     # Load and filter data
     filtered_sales_df, filtered_party_df, filtered_shortage_df, filtered_owners_df, filtered_bank_df, filtered_cheques_df, title_suffix = load_and_filter_data(display_start_date, display_end_date)
 
@@ -708,21 +1709,27 @@ else:
                 })
                 st.bar_chart(payment_data.set_index("Type"))
 
+            show_trends(display_start_date, display_end_date)
+
             st.subheader("📋 Sales Data")
-            display_sales_df = filtered_sales_df[[
-                "Date", "petrol_c3_sales", "petrol_c4_sales", "petrol_a1_sales", "petrol_a2_sales",
+            sales_table_columns = [
+                "id", "Date", "petrol_c3_sales", "petrol_c4_sales", "petrol_a1_sales", "petrol_a2_sales",
                 "hsd_c1_sales", "hsd_c2_sales", "hsd_b1_sales", "hsd_b2_sales",
                 "xp_b3_sales", "xp_b4_sales", "test_b1", "test_b2", "test_b3", "test_b4",
                 "petrol_amount", "hsd_amount", "xp_amount", "oil_products", "oil_amounts", "total_oil_amount",
                 "gross_sales_amount", "total_sales_amount",
                 "paytm_amount", "icici_amount", "fleet_card_amount", "pump_expenses", "pump_expenses_remark",
                 "cash_in", "cash_out", "net_cash", "credit_balance"
-            ]]
-            st.dataframe(display_sales_df)
+            ]
+            show_paginated_table(
+                filtered_sales_df, "sales_table", f"{get_data_version(SALES_DATA_PATH)}{title_suffix}",
+                columns=sales_table_columns,
+                default_columns=["id", "Date", "petrol_amount", "hsd_amount", "xp_amount", "total_oil_amount", "gross_sales_amount", "total_sales_amount", "cash_in", "cash_out", "net_cash", "credit_balance"]
+            )
             
             sales_pdf = generate_pdf(
                 f"Sales Report{title_suffix}",
-                display_sales_df,
+                filtered_sales_df,
                 ["Date", "petrol_amount", "hsd_amount", "xp_amount", "total_oil_amount", "total_sales_amount"],
                 {"total_sales_amount": filtered_sales_df["total_sales_amount"].sum()}
             )
@@ -730,13 +1737,19 @@ else:
 
         if not filtered_party_df.empty or not filtered_cheques_df.empty:
             st.markdown(f"<h2>📒 Party Ledger{title_suffix}</h2>", unsafe_allow_html=True)
-            party_summary = filtered_party_df.groupby("party_name").agg({
+            # Group on canonical name keys so spelling variants of a party share one balance
+            name_index, party_unknown = get_name_index(), {}
+            party_keys = encode_names("party", filtered_party_df["party_name"], name_index, party_unknown).rename("party_key")
+            cheque_party_keys = encode_names("party", filtered_cheques_df["party_name"], name_index, party_unknown).rename("party_key")
+            party_summary = filtered_party_df.groupby(party_keys).agg({
                 "credit_amount": "sum",
                 "debit_amount": "sum"
-            }).reset_index()
-            cheques_summary = filtered_cheques_df.groupby("party_name").agg({"amount": "sum"}).reset_index().rename(columns={"amount": "cheque_amount"})
-            party_summary = party_summary.merge(cheques_summary, on="party_name", how="left").fillna({"cheque_amount": 0.0})
+            })
+            cheques_summary = filtered_cheques_df.groupby(cheque_party_keys).agg({"amount": "sum"}).rename(columns={"amount": "cheque_amount"})
+            # Outer join, as in the streaming summary: parties with only cheques are listed too
+            party_summary = party_summary.join(cheques_summary, how="outer").fillna({"credit_amount": 0.0, "debit_amount": 0.0, "cheque_amount": 0.0})
             party_summary["Net Balance"] = party_summary["credit_amount"] - party_summary["debit_amount"] - party_summary["cheque_amount"]
+            party_summary.insert(0, "party_name", decode_names("party", party_summary.index, name_index, party_unknown))
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -750,24 +1763,24 @@ else:
                 st.markdown(f"<div class='metric-box'><span class='metric-label'>🏦 Total Cheques (₹)</span><br><span class='metric-value' style='color: #2980b9;'>{total_cheques:.2f}</span></div>", unsafe_allow_html=True)
 
             st.subheader("Party Balances Summary")
-            st.dataframe(party_summary)
+            st.dataframe(party_summary, hide_index=True)
 
             st.subheader("Party Net Balance (₹)")
             party_chart_data = party_summary[["party_name", "Net Balance"]].set_index("party_name")
             st.bar_chart(party_chart_data)
 
             st.subheader("Detailed Party Ledger")
-            for party in party_summary["party_name"].unique():
+            for party_key, party in party_summary["party_name"].items():
                 with st.expander(f"Ledger for {party}"):
-                    party_transactions = filtered_party_df[filtered_party_df["party_name"] == party][["Date", "credit_amount", "debit_amount", "remark"]]
-                    st.dataframe(party_transactions)
+                    party_transactions = filtered_party_df[party_keys.eq(party_key).fillna(False)][["id", "Date", "credit_amount", "debit_amount", "remark"]]
+                    show_paginated_table(party_transactions, f"party_table_{party}", f"{get_data_version(PARTY_LEDGER_PATH)}{title_suffix}")
                     
-                    party_cheques = filtered_cheques_df[filtered_cheques_df["party_name"] == party][["Date", "bank", "cheque_date", "cheque_no", "branch", "amount"]]
+                    party_cheques = filtered_cheques_df[cheque_party_keys.eq(party_key).fillna(False)][["id", "Date", "bank", "cheque_date", "cheque_no", "branch", "amount"]]
                     if not party_cheques.empty:
                         st.subheader(f"Cheque Transactions for {party}")
-                        st.dataframe(party_cheques)
+                        show_paginated_table(party_cheques, f"cheque_table_{party}", f"{get_data_version(PARTY_CHEQUES_PATH)}{title_suffix}")
                     
-                    net_balance = party_summary[party_summary["party_name"] == party]["Net Balance"].values[0]
+                    net_balance = party_summary.at[party_key, "Net Balance"]
                     color = "#27ae60" if net_balance >= 0 else "#e74c3c"
                     st.markdown(f"<p style='font-weight: bold; color: {color};'>Net Balance (after cheques): ₹{net_balance:.2f}</p>", unsafe_allow_html=True)
                     
@@ -790,16 +1803,22 @@ else:
 
         if not filtered_shortage_df.empty:
             st.markdown(f"<h2>👷 Employee Shortage{title_suffix}</h2>", unsafe_allow_html=True)
-            shortage_summary = filtered_shortage_df.groupby("employee_name").agg({
+            name_index, employee_unknown = get_name_index(), {}
+            employee_keys = encode_names("employee", filtered_shortage_df["employee_name"], name_index, employee_unknown).rename("employee_key")
+            shortage_summary = filtered_shortage_df.groupby(employee_keys).agg({
                 "shortage_amount": "sum"
-            }).reset_index()
+            })
+            shortage_summary.insert(0, "employee_name", decode_names("employee", shortage_summary.index, name_index, employee_unknown))
             
             st.subheader("Employee Shortages")
-            st.dataframe(shortage_summary)
+            st.dataframe(shortage_summary, hide_index=True)
 
             st.subheader("Shortage by Employee (₹)")
             shortage_chart_data = shortage_summary[["employee_name", "shortage_amount"]].set_index("employee_name")
             st.bar_chart(shortage_chart_data)
+
+            st.subheader("Shortage Entries")
+            show_paginated_table(filtered_shortage_df[["id", "Date", "employee_name", "shortage_amount"]], "shortage_table", f"{get_data_version(EMPLOYEE_SHORTAGE_PATH)}{title_suffix}")
             
             shortage_pdf = generate_pdf(
                 f"Employee Shortage Report{title_suffix}",
@@ -821,12 +1840,18 @@ else:
                 st.markdown(f"<div class='metric-box'><span class='metric-label'>📉 Total Owner’s Debit (₹)</span><br><span class='metric-value' style='color: #e74c3c;'>{owners_debit:.2f}</span></div>", unsafe_allow_html=True)
 
             st.subheader("Owner’s Transaction Summary")
-            owners_summary = filtered_owners_df.groupby(["owner_name", "mode", "type"]).agg({"amount": "sum"}).reset_index()
-            st.dataframe(owners_summary)
+            name_index, owner_unknown = get_name_index(), {}
+            owner_keys = encode_names("owner", filtered_owners_df["owner_name"], name_index, owner_unknown).rename("owner_key")
+            owners_summary = filtered_owners_df.groupby([owner_keys, "mode", "type"]).agg({"amount": "sum"}).reset_index()
+            owners_summary.insert(0, "owner_name", decode_names("owner", owners_summary.pop("owner_key"), name_index, owner_unknown))
+            st.dataframe(owners_summary, hide_index=True)
 
             st.subheader("Owner’s Credit vs Debit by Owner (₹)")
-            owners_chart_data = filtered_owners_df.pivot_table(index="owner_name", columns="type", values="amount", aggfunc="sum", fill_value=0)
+            owners_chart_data = owners_summary.pivot_table(index="owner_name", columns="type", values="amount", aggfunc="sum", fill_value=0)
             st.bar_chart(owners_chart_data)
+
+            st.subheader("Owner’s Transaction Entries")
+            show_paginated_table(filtered_owners_df[["id", "Date", "owner_name", "amount", "mode", "type"]], "owners_table", f"{get_data_version(OWNERS_TRANSACTION_PATH)}{title_suffix}")
             
             owners_pdf = generate_pdf(
                 f"Owner’s Transactions Report{title_suffix}",
@@ -839,8 +1864,8 @@ else:
         if not filtered_bank_df.empty:
             st.markdown(f"<h2>🏦 Bank Statements{title_suffix}</h2>", unsafe_allow_html=True)
             st.subheader("Extracted Transactions")
-            display_bank_df = filtered_bank_df[["Date", "description", "debit", "credit", "balance"]]
-            st.dataframe(display_bank_df)
+            display_bank_df = filtered_bank_df[["id", "Date", "description", "debit", "credit", "balance"]]
+            show_paginated_table(display_bank_df, "bank_table", f"{get_data_version(BANK_STATEMENTS_PATH)}{title_suffix}")
 
             col1, col2, col3 = st.columns(3)
             with col1: